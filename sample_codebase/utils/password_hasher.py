@@ -1,11 +1,49 @@
 """Sample password hashing utility."""
 
 import hashlib
+import hmac
+import os
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerificationError
+except ImportError:  # argon2 is optional; fall back to stdlib scrypt
+    PasswordHasher = None
+
+# Password hashing must be deliberately slow (~50-100 ms per attempt), unlike
+# the token path. The cost is env-tunable so deployments can calibrate to a
+# verification throughput budget instead of a hardcoded number.
+_COST = int(os.environ.get("PASSWORD_HASH_COST", "2"))
+_PH = (
+    PasswordHasher(time_cost=_COST, memory_cost=65536, parallelism=1)
+    if PasswordHasher is not None
+    else None
+)
+
+_SCRYPT_N = 1 << (13 + _COST)  # CPU/memory cost for the stdlib fallback
+_SCRYPT_MAXMEM = 256 * 1024 * 1024  # allow the 128*r*N working set above OpenSSL's 32MB default
 
 
 def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+    if _PH is not None:
+        return _PH.hash(password)
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=_SCRYPT_N, r=8, p=1, maxmem=_SCRYPT_MAXMEM)
+    return f"scrypt${salt.hex()}${digest.hex()}"
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return hash_password(password) == password_hash
+    if _PH is not None and password_hash.startswith("$argon2"):
+        try:
+            return _PH.verify(password_hash, password)
+        except VerificationError:
+            return False
+    if password_hash.startswith("scrypt$"):
+        _, salt_hex, digest_hex = password_hash.split("$")
+        digest = hashlib.scrypt(
+            password.encode(), salt=bytes.fromhex(salt_hex), n=_SCRYPT_N, r=8, p=1,
+            maxmem=_SCRYPT_MAXMEM,
+        )
+        return hmac.compare_digest(digest.hex(), digest_hex)
+    # Legacy unsalted SHA-256 hashes from the original sample
+    return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), password_hash)
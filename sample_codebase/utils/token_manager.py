@@ -3,13 +3,87 @@
 import hashlib
 import time
 
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:  # blake3 is optional; fall back to stdlib SHA-256
+    _blake3 = None
+
+try:
+    # Bind OpenSSL's one-shot constructor directly; for ~30-byte payloads the
+    # wrapper overhead dominates, not the SHA itself.
+    from _hashlib import openssl_sha256 as _sha256
+except ImportError:
+    _sha256 = hashlib.sha256
+
+
+def _hash_payload(payload: bytes) -> str:
+    # BLAKE3 is ~2x faster than SHA-256 on short inputs and the token is an
+    # opaque identifier, so the algorithm is interchangeable. length=32 keeps
+    # the 64-hex-char shape that validate_token expects.
+    if _blake3 is not None:
+        return _blake3(payload).hexdigest(length=32)
+    return _sha256(payload).digest().hex()
+
 
 def generate_token(user_id: str, role: str) -> str:
-    payload = f"{user_id}:{role}:{time.time()}"
-    return hashlib.sha256(payload.encode()).hexdigest()
+    # Build the payload as bytes directly: monotonic_ns() skips the float
+    # formatting that f"{time.time()}" pays, and the concat avoids the
+    # str-then-encode double allocation.
+    payload = (
+        user_id.encode() + b":" + role.encode() + b":"
+        + time.monotonic_ns().to_bytes(8, "little")
+    )
+    return _hash_payload(payload)
+
+
+def generate_tokens(pairs: list[tuple[str, str]]) -> list[str]:
+    """Batch-mint tokens for (user_id, role) pairs, reusing one buffer."""
+    buf = bytearray()
+    tokens = []
+    for user_id, role in pairs:
+        buf.clear()
+        buf += user_id.encode()
+        buf += b":"
+        buf += role.encode()
+        buf += b":"
+        buf += time.monotonic_ns().to_bytes(8, "little")
+        tokens.append(_hash_payload(bytes(buf)))
+    return tokens
+
+
+def generate_tokens_batch(payloads: list[bytes]) -> list[str]:
+    """Hash pre-built payloads in bulk.
+
+    Single tight loop over a locally bound hasher so batch callers (refund
+    jobs, webhook replay) avoid per-call global lookups. A multi-buffer
+    SHA-256 extension (isa-l_crypto / intel-ipsec-mb) could replace the loop
+    body for 4x/8x lane throughput without changing this signature.
+    """
+    hash_payload = _hash_payload
+    return [hash_payload(p) for p in payloads]
+
+
+# Validated payloads keyed by raw token. The same bearer token is reused for
+# its whole lifetime, so a hit collapses verification to a dict lookup.
+# Invalid tokens are never cached.
+_TOKEN_CACHE: dict[str, dict] = {}
+_TOKEN_CACHE_MAX = 4096
 
 
 def validate_token(token: str) -> dict | None:
+    cached = _TOKEN_CACHE.get(token)
+    if cached is not None:
+        return cached
     if not token or len(token) != 64:
         return None
-    return {"user_id": "extracted_id", "role": "user", "valid": True}
+    payload = {"user_id": "extracted_id", "role": "user", "valid": True}
+    if len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAX:
+        # Drop the oldest entry (insertion order) to bound memory.
+        _TOKEN_CACHE.pop(next(iter(_TOKEN_CACHE)))
+    _TOKEN_CACHE[token] = payload
+    return payload
+
+
+def invalidate_token(token: str) -> None:
+    """Evict a token from the validation cache (e.g. on logout)."""
+    _TOKEN_CACHE.pop(token, None)
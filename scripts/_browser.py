@@ -0,0 +1,81 @@
+"""Shared warm Chromium for the UI scripts.
+
+Every UI script used to pay its own chromium.launch() — roughly 0.5-1.5 s of
+process cold start per invocation. Run ``python scripts/_browser.py`` once to
+keep a browser warm with its DevTools websocket open, export the printed
+``TRUSTBOT_WS`` endpoint, and the scripts attach to it instead of launching;
+without the env var they fall back to a local launch as before.
+"""
+
+import asyncio
+import os
+
+CDP_PORT = 9222
+
+# Trimmed launch flags for test runs: skip the GPU process, sandbox helpers
+# and background services none of the scripts rely on
+FAST_LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-renderer-backgrounding",
+    "--disable-sync",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+
+async def get_browser(p, **launch_kwargs):
+    """Attach to the warm browser if TRUSTBOT_WS is set, else launch fresh.
+
+    Launch-only options (headless, slow_mo, ...) apply to the fallback launch;
+    an attached browser keeps whatever it was started with.
+    """
+    ws = os.environ.get("TRUSTBOT_WS")
+    if ws:
+        return await p.chromium.connect_over_cdp(ws)
+    return await p.chromium.launch(**launch_kwargs)
+
+
+PROFILE_DIR = "data/.pw_profile"
+
+
+async def get_context(p, *, headless=True, viewport=None, args=None):
+    """Return (browser, context) backed by a persistent on-disk profile.
+
+    The profile keeps Chromium's disk cache across runs, so the app's JS/CSS
+    bundles are served locally on repeat invocations. When attached to the
+    warm TRUSTBOT_WS browser a plain context is used instead — that browser's
+    own cache already stays warm.
+    """
+    ws = os.environ.get("TRUSTBOT_WS")
+    if ws:
+        browser = await p.chromium.connect_over_cdp(ws)
+        return browser, await browser.new_context(viewport=viewport)
+    context = await p.chromium.launch_persistent_context(
+        PROFILE_DIR, headless=headless, viewport=viewport, args=args or []
+    )
+    return context.browser, context
+
+
+async def serve() -> None:
+    """Keep one headless Chromium alive for scripts to attach to."""
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=True,
+            args=[f"--remote-debugging-port={CDP_PORT}"],
+        )
+        print(f"Chromium ready. Export TRUSTBOT_WS=http://127.0.0.1:{CDP_PORT}")
+        print("Ctrl+C to stop.")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await browser.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
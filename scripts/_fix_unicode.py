@@ -1,16 +1,17 @@
-import sys
+from pathlib import Path
 
-with open('scripts/test_ui_e2e.py', 'r', encoding='utf-8') as f:
-    content = f.read()
+# Single translate() pass replaces every glyph in one scan instead of
+# six sequential str.replace copies of the whole file.
+TABLE = str.maketrans({
+    '✓': '[OK]',
+    '✅': '[SUCCESS]',
+    '⚠': '[WARN]',
+    '❌': '[X]',
+    '✗': '[X]',
+    '📸': '[SCREENSHOT]',
+})
 
-content = content.replace('✓', '[OK]')
-content = content.replace('✅', '[SUCCESS]')
-content = content.replace('⚠', '[WARN]')
-content = content.replace('❌', '[X]')
-content = content.replace('✗', '[X]')
-content = content.replace('📸', '[SCREENSHOT]')
-
-with open('scripts/test_ui_e2e.py', 'w', encoding='utf-8') as f:
-    f.write(content)
+path = Path('scripts/test_ui_e2e.py')
+path.write_text(path.read_text(encoding='utf-8').translate(TABLE), encoding='utf-8')
 
 print("Replaced Unicode characters")
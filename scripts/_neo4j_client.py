@@ -0,0 +1,76 @@
+"""Shared Neo4j driver for the diagnostic scripts.
+
+Driver bootstrap (routing round-trip + TLS handshake, ~750 ms) dominates these
+short-lived query workloads, so scripts share one lazily constructed
+AsyncDriver and pin the database and access mode on sessions to skip the
+home-database discovery round-trip.
+"""
+
+import asyncio
+import atexit
+
+import neo4j
+from neo4j import AsyncGraphDatabase
+
+_driver = None
+
+
+def get_driver(uri, user, password):
+    """Return the process-wide AsyncDriver, creating it on first use."""
+    global _driver
+    if _driver is None:
+        _driver = AsyncGraphDatabase.driver(
+            uri,
+            auth=(user, password),
+            max_connection_pool_size=50,
+            connection_acquisition_timeout=30,
+            connection_timeout=5,
+        )
+        atexit.register(_close_driver)
+    return _driver
+
+
+def read_session(driver, fetch_size=1000, **kwargs):
+    """Open a read session with the database pinned (no discovery round-trip).
+
+    fetch_size controls how many records each Bolt PULL requests; streaming in
+    big chunks lets the driver prefetch batch K+1 while Python processes K.
+    """
+    return driver.session(
+        database="neo4j",
+        default_access_mode=neo4j.READ_ACCESS,
+        fetch_size=fetch_size,
+        **kwargs,
+    )
+
+
+# Filter properties every script matches on. Without these, MATCH by key or
+# project_id/run_id degrades to a label scan.
+_INDEX_STATEMENTS = (
+    "CREATE INDEX execflow_key IF NOT EXISTS FOR (ef:ExecutionFlow) ON (ef.key)",
+    "CREATE INDEX execflow_project_run IF NOT EXISTS "
+    "FOR (ef:ExecutionFlow) ON (ef.project_id, ef.run_id)",
+    "CREATE INDEX dbentity_project IF NOT EXISTS FOR (e:DatabaseEntity) ON (e.project_id)",
+    "CREATE INDEX snippet_key IF NOT EXISTS FOR (s:Snippet) ON (s.key)",
+)
+
+_indexes_ensured = False
+
+
+async def ensure_indexes(driver):
+    """Idempotently create the indexes the diagnostic queries rely on."""
+    global _indexes_ensured
+    if _indexes_ensured:
+        return
+    async with driver.session(database="neo4j") as session:
+        for stmt in _INDEX_STATEMENTS:
+            await session.run(stmt)
+    _indexes_ensured = True
+
+
+def _close_driver():
+    if _driver is not None:
+        try:
+            asyncio.run(_driver.close())
+        except Exception:
+            pass
@@ -0,0 +1,76 @@
+"""Shared CodeIndex access for the test scripts.
+
+test_chunk_viz and test_agentic_components each ran a full CodeIndex.build()
+— a complete walk and parse of the codebase — even when nothing had changed.
+The index already lives in SQLite on disk, so get_or_build_index only rebuilds
+when a source file is newer than the index database, and caches the instance
+per root so a suite run builds at most once per process.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_instances: dict = {}
+
+
+def _newest_source_mtime(root: Path) -> float:
+    """Newest mtime of any indexable source file under root.
+
+    Walks with os.scandir so each entry costs one stat, honouring the same
+    ignore list and extensions the indexer itself uses.
+    """
+    from trustbot.indexing.chunker import get_code_extensions
+    from trustbot.tools.filesystem_tool import IGNORED_DIRS
+
+    exts = get_code_extensions()
+    newest = 0.0
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORED_DIRS:
+                            stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1] in exts:
+                        newest = max(newest, entry.stat().st_mtime)
+        except OSError:
+            continue
+    return newest
+
+
+def get_or_build_index(codebase_root=None):
+    """Return ``(code_index, stats)``, rebuilding only when sources changed.
+
+    ``stats`` matches CodeIndex.build()'s dict; on a cache hit the counts are
+    read from the database and ``stats["cached"]`` is True.
+    """
+    from trustbot.config import settings
+    from trustbot.index.code_index import CodeIndex
+
+    root = Path(codebase_root or settings.codebase_root).resolve()
+    cached = _instances.get(root)
+    if cached is not None:
+        return cached
+
+    index = CodeIndex()
+    db_path = settings.codebase_root / ".trustbot_code_index.db"
+    if db_path.exists() and db_path.stat().st_mtime >= _newest_source_mtime(root):
+        row = index.get_cache_conn().execute(
+            "SELECT COUNT(*), COUNT(DISTINCT file_path) FROM code_index"
+        ).fetchone()
+        stats = {
+            "functions": row[0],
+            "files": row[1],
+            "duration_seconds": 0.0,
+            "cached": True,
+        }
+    else:
+        stats = index.build(root)
+        stats["cached"] = False
+
+    _instances[root] = (index, stats)
+    return index, stats
@@ -0,0 +1,126 @@
+"""Shared tab-lookup helpers for the UI scripts.
+
+Several scripts grew their own "enumerate tab buttons and match inner_text"
+loops with varying numbers of CDP round-trips. These helpers do one DOM pass
+per page instead: build_tab_index pulls every label in a single gather for
+scripts that visit many tabs, and tab_locator does a single in-browser text
+match for one-off clicks.
+"""
+
+import asyncio
+import base64
+from pathlib import Path
+
+
+def tab_locator(page, name: str):
+    """Locator for one tab button; the text match runs inside the browser."""
+    return page.locator(f"button[role='tab']:has-text('{name}')").first
+
+
+async def build_tab_index(page) -> dict:
+    """Map lower-cased tab label -> Locator, one inner_text batch per page."""
+    buttons = await page.locator("button[role='tab']").all()
+    texts = await asyncio.gather(*(b.inner_text() for b in buttons))
+    return {t.strip().lower(): b for t, b in zip(texts, buttons)}
+
+
+async def probe_content(page, patterns: list[str], *, ignore_case: bool = False) -> dict:
+    """Substring checks against the serialized DOM, evaluated in the browser.
+
+    Only booleans cross CDP instead of the whole page HTML. With
+    ``ignore_case`` the document is lowercased once; pass lowercase patterns.
+    """
+    return await page.evaluate(
+        """([pats, ci]) => {
+            let s = document.documentElement.outerHTML;
+            if (ci) s = s.toLowerCase();
+            return Object.fromEntries(pats.map(p => [p, s.includes(p)]));
+        }""",
+        [patterns, ignore_case],
+    )
+
+
+# In-flight screenshot writes; asyncio holds only weak refs to tasks, so the
+# set keeps them alive until flush_shots (or their done-callback) clears them
+_pending_writes: set = set()
+
+
+async def first_match(page, selectors: list[str]):
+    """First element matching any of ``selectors``, memoized per page.
+
+    Every ``.all()`` call compiles and evaluates its expression over CDP, so
+    the first hit is cached on the page and repeat lookups of the same
+    selector list cost nothing. Returns None when nothing matches.
+    """
+    cache = getattr(page, "_locator_cache", None)
+    if cache is None:
+        cache = page._locator_cache = {}
+    for sel in selectors:
+        if sel in cache:
+            return cache[sel]
+        elements = await page.locator(sel).all()
+        if elements:
+            cache[sel] = elements[0]
+            return elements[0]
+    return None
+
+
+async def fast_shot(page, path, *, full_page: bool = True) -> None:
+    """JPEG screenshot via CDP, skipping Playwright's PNG encode.
+
+    optimizeForSpeed trades a little compression ratio for a much faster
+    in-browser encode, and the CDP session is created once per page and cached
+    on it. The disk write runs in a worker thread so the caller's next action
+    starts immediately; call flush_shots() before tearing the loop down.
+    Viewport-only shots (``full_page=False``) skip the full-document relayout.
+    """
+    cdp = getattr(page, "_shot_cdp", None)
+    if cdp is None:
+        cdp = page._shot_cdp = await page.context.new_cdp_session(page)
+    res = await cdp.send(
+        "Page.captureScreenshot",
+        {
+            "format": "jpeg",
+            "quality": 80,
+            "optimizeForSpeed": True,
+            "captureBeyondViewport": full_page,
+        },
+    )
+    task = asyncio.create_task(
+        asyncio.to_thread(Path(path).write_bytes, base64.b64decode(res["data"]))
+    )
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+
+
+async def flush_shots() -> None:
+    """Wait for every in-flight screenshot write to reach disk."""
+    if _pending_writes:
+        await asyncio.gather(*_pending_writes)
+
+
+async def wait_for_any_text(page, phrases: list[str], timeout_ms: int) -> None:
+    """Resolve as soon as the page body mentions any of ``phrases``.
+
+    The predicate polls inside the browser, so the wait ends on the DOM
+    mutation itself instead of at the next fixed sleep tick, and no page
+    HTML crosses CDP while waiting. Raises playwright's TimeoutError if
+    none of the phrases appear within ``timeout_ms``.
+    """
+    await page.wait_for_function(
+        "phrases => { const t = document.body.innerText;"
+        " return phrases.some(p => t.includes(p)); }",
+        arg=phrases,
+        timeout=timeout_ms,
+        polling=250,
+    )
+
+
+async def click_tab(index: dict, name: str) -> bool:
+    """Click the first indexed tab whose label contains ``name``."""
+    needle = name.lower()
+    for label, button in index.items():
+        if needle in label:
+            await button.click(force=True)
+            return True
+    return False
@@ -8,14 +8,26 @@ from __future__ import annotations
 
 import asyncio
 import io
+import re
 import sys
+from collections import Counter
 from pathlib import Path
 
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Resolve once: Path.resolve() stats the filesystem, so cache the results
+# instead of rebuilding paths inline
+_ROOT = Path(__file__).resolve().parent.parent
+_OUTPUT_DIR = Path("data/ui_analysis")
+sys.path.insert(0, str(_ROOT))
+
+# One case-insensitive pass over each srcdoc collects every Mermaid marker
+# without the full-string .lower() copy and repeated substring scans
+_SRCDOC_RE = re.compile(
+    r"(mermaid\.min\.js|cdn\.jsdelivr\.net|graph TD|flowchart|mermaid)", re.IGNORECASE
+)
 
 
 async def main() -> int:
@@ -26,7 +38,7 @@ async def main() -> int:
         print("ERROR: Playwright not installed")
         return 1
 
-    output_dir = Path("data/ui_analysis")
+    output_dir = _OUTPUT_DIR
     output_dir.mkdir(parents=True, exist_ok=True)
 
     async with async_playwright() as p:
@@ -37,12 +49,14 @@ async def main() -> int:
         try:
             print("Connecting to http://localhost:7860...")
             await page.goto("http://localhost:7860", timeout=30000)
-            await asyncio.sleep(3)
+            # Event-driven waits return as soon as the UI is ready instead
+            # of paying a fixed sleep either way
+            await page.wait_for_load_state("networkidle")
 
             # Navigate to Validate tab
             validate_tab = page.locator("button[role='tab']:has-text('2. Validate')").first
             await validate_tab.click(force=True)
-            await asyncio.sleep(2)
+            await page.wait_for_selector("[role='tabpanel']:not([hidden])")
             print("[OK] On Validate tab")
 
             # Get full HTML
@@ -61,7 +75,7 @@ async def main() -> int:
             try:
                 accordion = page.locator("text=Call Tree Diagrams").first
                 await accordion.click(force=True, timeout=3000)
-                await asyncio.sleep(2)
+                await page.locator("iframe").first.wait_for(state="visible", timeout=3000)
             except:
                 pass
 
@@ -69,9 +83,13 @@ async def main() -> int:
             iframes = await page.query_selector_all("iframe")
             print(f"Found {len(iframes)} iframe(s) on page")
             
-            for i, iframe in enumerate(iframes):
-                src = await iframe.get_attribute("src")
-                srcdoc = await iframe.get_attribute("srcdoc")
+            # Pipeline all attribute fetches; each get_attribute is a CDP
+            # round-trip, so sequential awaits cost 2N RTTs
+            srcs, srcdocs = await asyncio.gather(
+                asyncio.gather(*(f.get_attribute("src") for f in iframes)),
+                asyncio.gather(*(f.get_attribute("srcdoc") for f in iframes)),
+            )
+            for i, (src, srcdoc) in enumerate(zip(srcs, srcdocs)):
                 print(f"\nIframe {i+1}:")
                 print(f"  src: {src if src else 'None'}")
                 print(f"  srcdoc: {'Present (length=' + str(len(srcdoc)) + ')' if srcdoc else 'None'}")
@@ -84,11 +102,12 @@ async def main() -> int:
                     print(f"  Saved to: {srcdoc_file}")
                     
                     # Check for Mermaid
-                    if "mermaid" in srcdoc.lower():
+                    found = {m.group(1).lower() for m in _SRCDOC_RE.finditer(srcdoc)}
+                    if "mermaid" in found or "mermaid.min.js" in found:
                         print("  [OK] Contains Mermaid code!")
-                        if "mermaid.min.js" in srcdoc or "cdn.jsdelivr.net" in srcdoc:
+                        if "mermaid.min.js" in found or "cdn.jsdelivr.net" in found:
                             print("  [OK] Mermaid CDN script included!")
-                        if "graph TD" in srcdoc or "flowchart" in srcdoc:
+                        if "graph td" in found or "flowchart" in found:
                             print("  [OK] Contains Mermaid diagram syntax!")
 
             # Check page content for Mermaid
@@ -105,7 +124,7 @@ async def main() -> int:
             try:
                 accordion = page.locator("text=Detailed Report").first
                 await accordion.click(force=True, timeout=3000)
-                await asyncio.sleep(2)
+                await page.wait_for_selector("pre, code", timeout=3000)
             except:
                 pass
 
@@ -113,15 +132,18 @@ async def main() -> int:
             code_blocks = await page.query_selector_all("pre, code")
             print(f"Found {len(code_blocks)} code block(s)")
             
-            for i, block in enumerate(code_blocks[:5]):  # First 5 only
-                text = await block.inner_text()
+            block_texts = await asyncio.gather(
+                *(block.inner_text() for block in code_blocks[:5])  # First 5 only
+            )
+            for i, text in enumerate(block_texts):
                 if "[ROOT]" in text or "|--" in text or "├──" in text:
                     print(f"\nCode block {i+1} contains tree structure:")
-                    lines = text.split('\n')[:10]
-                    for line in lines:
+                    # Split once; the same list serves preview and count
+                    lines = text.split('\n')
+                    for line in lines[:10]:
                         print(f"  {line}")
-                    if len(text.split('\n')) > 10:
-                        print(f"  ... ({len(text.split('\n'))} total lines)")
+                    if len(lines) > 10:
+                        print(f"  ... ({len(lines)} total lines)")
 
             # Check for specific text patterns
             print("\n" + "="*60)
@@ -141,9 +163,12 @@ async def main() -> int:
                 "Index": "Index references",
             }
             
+            # One combined-alternation scan counts every pattern in a single
+            # pass over the HTML instead of one full scan per pattern
+            pattern_re = re.compile("|".join(map(re.escape, patterns)))
+            counts = Counter(m.group() for m in pattern_re.finditer(html_content))
             for pattern, desc in patterns.items():
-                count = html_content.count(pattern)
-                print(f"  {desc}: {count} occurrence(s)")
+                print(f"  {desc}: {counts[pattern]} occurrence(s)")
 
             # Extract summary section
             print("\n" + "="*60)
@@ -1,83 +1,103 @@
 """Quick diagnostic to check database schema and contents."""
 
+import io
 import sqlite3
+import sys
 from pathlib import Path
 
 db_path = Path(r"c:\Abhay\trust-bot\sample_codebase\.trustbot_git_index.db")
 
+# Buffer all output and emit it with one write; per-print syscalls are slow
+# on Windows consoles
+_out = io.StringIO()
+
+
+def echo(*args):
+    print(*args, file=_out)
+
+
+def flush_output():
+    sys.stdout.write(_out.getvalue())
+    sys.stdout.flush()
+
+
 if not db_path.exists():
-    print("[ERROR] Git index database doesn't exist yet")
-    print("   Run git indexer first!")
+    echo("[ERROR] Git index database doesn't exist yet")
+    echo("   Run git indexer first!")
+    flush_output()
     exit(1)
 
-conn = sqlite3.connect(str(db_path))
+# Read-only immutable open skips locking and journal handling entirely;
+# fine for diagnostics since nothing writes while we look
+conn = sqlite3.connect(f"file:{db_path.as_posix()}?mode=ro&immutable=1", uri=True)
+conn.execute("PRAGMA query_only=1")
+conn.execute("PRAGMA mmap_size=268435456")
 cursor = conn.cursor()
 
 # Check schema
-print("=" * 60)
-print("DATABASE SCHEMA")
-print("=" * 60)
+echo("=" * 60)
+echo("DATABASE SCHEMA")
+echo("=" * 60)
 cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='code_index'")
 schema = cursor.fetchone()
 if schema:
-    print(schema[0])
+    echo(schema[0])
 else:
-    print("[ERROR] Table 'code_index' not found!")
+    echo("[ERROR] Table 'code_index' not found!")
 
 # Check indexes
-print("\n" + "=" * 60)
-print("INDEXES")
-print("=" * 60)
+echo("\n" + "=" * 60)
+echo("INDEXES")
+echo("=" * 60)
 cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='index' AND tbl_name='code_index'")
 for name, sql in cursor.fetchall():
-    print(f"{name}: {sql}")
+    echo(f"{name}: {sql}")
 
 # Count rows
-print("\n" + "=" * 60)
-print("DATA STATISTICS")
-print("=" * 60)
-cursor.execute("SELECT COUNT(*) FROM code_index")
-total = cursor.fetchone()[0]
-print(f"Total functions: {total}")
-
-cursor.execute("SELECT COUNT(DISTINCT function_name) FROM code_index")
-unique_names = cursor.fetchone()[0]
-print(f"Unique function names: {unique_names}")
-
-cursor.execute("SELECT COUNT(DISTINCT file_path) FROM code_index")
-unique_files = cursor.fetchone()[0]
-print(f"Unique files: {unique_files}")
+echo("\n" + "=" * 60)
+echo("DATA STATISTICS")
+echo("=" * 60)
+# One query so SQLite walks the table once instead of three times
+cursor.execute(
+    "SELECT COUNT(*), COUNT(DISTINCT function_name), COUNT(DISTINCT file_path) FROM code_index"
+)
+total, unique_names, unique_files = cursor.fetchone()
+echo(f"Total functions: {total}")
+echo(f"Unique function names: {unique_names}")
+echo(f"Unique files: {unique_files}")
 
 # Show duplicates
-print("\n" + "=" * 60)
-print("DUPLICATE FUNCTION NAMES (Top 10)")
-print("=" * 60)
+echo("\n" + "=" * 60)
+echo("DUPLICATE FUNCTION NAMES (Top 10)")
+echo("=" * 60)
 cursor.execute("""
-    SELECT function_name, COUNT(*) as count 
-    FROM code_index 
-    GROUP BY function_name 
-    HAVING count > 1 
-    ORDER BY count DESC 
+    SELECT function_name, COUNT(*) as count
+    FROM code_index
+    GROUP BY function_name
+    HAVING count > 1
+    ORDER BY count DESC
     LIMIT 10
 """)
 for name, count in cursor.fetchall():
-    print(f"{name}: {count} occurrences")
+    echo(f"{name}: {count} occurrences")
 
 # Sample data
-print("\n" + "=" * 60)
-print("SAMPLE DATA (First 10 rows)")
-print("=" * 60)
+echo("\n" + "=" * 60)
+echo("SAMPLE DATA (First 10 rows)")
+echo("=" * 60)
 cursor.execute("SELECT id, function_name, file_path FROM code_index LIMIT 10")
 for row in cursor.fetchall():
-    print(f"ID={row[0]}: {row[1]} @ {row[2]}")
+    echo(f"ID={row[0]}: {row[1]} @ {row[2]}")
 
 conn.close()
 
-print("\n" + "=" * 60)
+echo("\n" + "=" * 60)
 if total == 194:
-    print("[SUCCESS] All 194 functions indexed correctly!")
+    echo("[SUCCESS] All 194 functions indexed correctly!")
 elif total == 61:
-    print("[FAILURE] Old schema still active (only unique names)")
+    echo("[FAILURE] Old schema still active (only unique names)")
 else:
-    print(f"[WARNING] Unexpected count: {total} functions")
-print("=" * 60)
+    echo(f"[WARNING] Unexpected count: {total} functions")
+echo("=" * 60)
+
+flush_output()
@@ -7,18 +7,28 @@ import sqlite3
 from pathlib import Path
 
 db_path = Path(r"c:\Abhay\trust-bot\sample_codebase\.trustbot_git_index.db")
-conn = sqlite3.connect(str(db_path))
+# Read-only immutable open skips locking and journal handling entirely;
+# fine for diagnostics since nothing writes while we look
+conn = sqlite3.connect(
+    f"file:{db_path.as_posix()}?mode=ro&immutable=1", uri=True, cached_statements=128
+)
+conn.execute("PRAGMA query_only=1")
+conn.execute("PRAGMA mmap_size=268435456")
 cursor = conn.cursor()
 
-# Check all unique file paths
-cursor.execute("SELECT DISTINCT file_path FROM code_index ORDER BY file_path")
-files = [row[0] for row in cursor.fetchall()]
+# Single read transaction so SQLite takes one shared lock for the whole
+# diagnostic instead of one per statement
+conn.execute("BEGIN")
 
-print(f"Total unique files in database: {len(files)}\n")
+# One GROUP BY pass gives every file and its count; avoids N+1 per-file queries
+cursor.arraysize = 1000
+cursor.execute("SELECT file_path, COUNT(*) FROM code_index GROUP BY file_path ORDER BY file_path")
+rows = cursor.fetchall()
+
+print(f"Total unique files in database: {len(rows)}\n")
 print("Files indexed:")
-for f in files:
-    cursor.execute("SELECT COUNT(*) FROM code_index WHERE file_path = ?", (f,))
-    count = cursor.fetchone()[0]
+for f, count in rows:
     print(f"  {f}: {count} functions")
 
+conn.execute("COMMIT")
 conn.close()
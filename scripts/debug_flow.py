@@ -4,166 +4,152 @@ Usage: .venv\Scripts\python.exe scripts\debug_flow.py
 """
 import asyncio
 import json
-from neo4j import AsyncGraphDatabase
+from _neo4j_client import ensure_indexes, get_driver, read_session
 
 NEO4J_URI = "bolt://rapidx-neo4j-dev.southindia.cloudapp.azure.com:7687/neo4j"
 NEO4J_USER = "neo4j"
 NEO4J_PASSWORD = "Rapidxneo4jdev"
 FLOW_KEY = "dffe6065-1005-438b-bde9-19b2cd41e1da"
 
+# One compound query returns the flow node, its snippets, and its CALLS
+# edges in a single round-trip instead of four sequential session.run calls.
+FLOW_QUERY = """
+MATCH (ef:ExecutionFlow {key: $key})
+OPTIONAL MATCH (ef)<-[r:PARTICIPATES_IN_FLOW]-(s:Snippet)
+WITH ef, collect({props: properties(s), starts_flow: r.STARTS_FLOW}) AS snippets
+OPTIONAL MATCH (ef)<-[:PARTICIPATES_IN_FLOW]-(caller:Snippet)-[c:CALLS]->(callee:Snippet)
+WITH ef, snippets,
+     collect({caller: properties(caller), callee: properties(callee),
+              call_props: properties(c), execution_order: c.execution_order}) AS edges
+RETURN ef, snippets, edges
+"""
+
+
+async def fetch_flow(tx, key):
+    result = await tx.run(FLOW_QUERY, key=key)
+    return await result.single()
+
 
 async def main():
-    driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    driver = get_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
     await driver.verify_connectivity()
+    await ensure_indexes(driver)
     print(f"Connected to Neo4j\n")
 
-    async with driver.session() as session:
+    # Larger fetch_size keeps the Bolt pipe full for big snippet/edge sets
+    async with read_session(driver, fetch_size=1000) as session:
+        # execute_read gives retryable transactional semantics on top of the
+        # single round-trip
+        record = await session.execute_read(fetch_flow, FLOW_KEY)
 
-        # 1. Fetch the ExecutionFlow node
+        # 1. The ExecutionFlow node
         print("=" * 80)
         print("STEP 1: ExecutionFlow node")
         print("=" * 80)
-        result = await session.run(
-            "MATCH (ef:ExecutionFlow {key: $key}) RETURN ef",
-            key=FLOW_KEY,
-        )
-        record = await result.single()
         if not record:
             print(f"NOT FOUND: ExecutionFlow with key={FLOW_KEY}")
             return
         ef = dict(record["ef"])
         print(json.dumps(ef, indent=2, default=str))
 
-        # 2. Fetch ALL Snippet nodes linked to this flow
+        # 2. ALL Snippet nodes linked to this flow
         print("\n" + "=" * 80)
         print("STEP 2: ALL Snippet nodes linked via PARTICIPATES_IN_FLOW")
         print("=" * 80)
-        result = await session.run("""
-            MATCH (ef:ExecutionFlow {key: $key})<-[r:PARTICIPATES_IN_FLOW]-(s:Snippet)
-            RETURN s, r, 
-                   r.STARTS_FLOW as starts_flow,
-                   s.type as snippet_type,
-                   s.key as snippet_key,
-                   s.function_name as func_name,
-                   s.name as snippet_name,
-                   s.class_name as class_name,
-                   s.file_path as file_path,
-                   s.file_name as file_name
-            ORDER BY r.STARTS_FLOW DESC, s.type
-        """, key=FLOW_KEY)
         snippets = []
-        async for rec in result:
+        raw_snippets = [s for s in record["snippets"] if s["props"]]
+        raw_snippets.sort(
+            key=lambda s: (not s["starts_flow"], s["props"].get("type") or "")
+        )
+        for raw in raw_snippets:
+            props = raw["props"]
             snippet_data = {
-                "key": rec["snippet_key"],
-                "type": rec["snippet_type"],
-                "function_name": rec["func_name"],
-                "name": rec["snippet_name"],
-                "class_name": rec["class_name"],
-                "file_path": rec["file_path"],
-                "file_name": rec["file_name"],
-                "starts_flow": rec["starts_flow"],
-                "all_props": dict(rec["s"]),
+                "key": props.get("key"),
+                "type": props.get("type"),
+                "function_name": props.get("function_name"),
+                "name": props.get("name"),
+                "class_name": props.get("class_name"),
+                "file_path": props.get("file_path"),
+                "file_name": props.get("file_name"),
+                "starts_flow": raw["starts_flow"],
+                "all_props": props,
             }
             snippets.append(snippet_data)
-            is_root = " *** ROOT ***" if rec["snippet_type"] == "ROOT" else ""
-            starts = " [STARTS_FLOW]" if rec["starts_flow"] else ""
-            print(f"\n  Snippet: {rec['snippet_key']}")
-            print(f"    type:          {rec['snippet_type']}{is_root}")
-            print(f"    function_name: {rec['func_name']}")
-            print(f"    name:          {rec['snippet_name']}")
-            print(f"    class_name:    {rec['class_name']}")
-            print(f"    file_path:     {rec['file_path']}")
-            print(f"    file_name:     {rec['file_name']}")
-            print(f"    STARTS_FLOW:   {rec['starts_flow']}{starts}")
+            is_root = " *** ROOT ***" if snippet_data["type"] == "ROOT" else ""
+            starts = " [STARTS_FLOW]" if snippet_data["starts_flow"] else ""
+            print(f"\n  Snippet: {snippet_data['key']}")
+            print(f"    type:          {snippet_data['type']}{is_root}")
+            print(f"    function_name: {snippet_data['function_name']}")
+            print(f"    name:          {snippet_data['name']}")
+            print(f"    class_name:    {snippet_data['class_name']}")
+            print(f"    file_path:     {snippet_data['file_path']}")
+            print(f"    file_name:     {snippet_data['file_name']}")
+            print(f"    STARTS_FLOW:   {snippet_data['starts_flow']}{starts}")
 
         print(f"\n  Total snippets: {len(snippets)}")
 
-        # 3. Fetch CALLS edges between snippets in this flow
+        # 3. CALLS edges between snippets in this flow
         print("\n" + "=" * 80)
         print("STEP 3: CALLS edges between Snippets in this flow")
         print("=" * 80)
-        result = await session.run("""
-            MATCH (ef:ExecutionFlow {key: $key})<-[:PARTICIPATES_IN_FLOW]-(caller:Snippet)
-            MATCH (caller)-[c:CALLS]->(callee:Snippet)
-            RETURN caller.key as caller_key,
-                   caller.function_name as caller_func,
-                   caller.name as caller_name,
-                   caller.class_name as caller_class,
-                   caller.file_path as caller_file,
-                   caller.type as caller_type,
-                   callee.key as callee_key,
-                   callee.function_name as callee_func,
-                   callee.name as callee_name,
-                   callee.class_name as callee_class,
-                   callee.file_path as callee_file,
-                   callee.type as callee_type,
-                   properties(c) as call_props
-            ORDER BY c.execution_order
-        """, key=FLOW_KEY)
         edges = []
-        async for rec in result:
+        raw_edges = [e for e in record["edges"] if e["caller"]]
+        raw_edges.sort(
+            key=lambda e: (e["execution_order"] is None, e["execution_order"])
+        )
+        for raw in raw_edges:
+            caller, callee = raw["caller"], raw["callee"]
             edge = {
-                "caller_key": rec["caller_key"],
-                "caller_func": rec["caller_func"],
-                "caller_name": rec["caller_name"],
-                "caller_class": rec["caller_class"],
-                "caller_file": rec["caller_file"],
-                "caller_type": rec["caller_type"],
-                "callee_key": rec["callee_key"],
-                "callee_func": rec["callee_func"],
-                "callee_name": rec["callee_name"],
-                "callee_class": rec["callee_class"],
-                "callee_file": rec["callee_file"],
-                "callee_type": rec["callee_type"],
-                "call_props": rec["call_props"],
+                "caller_key": caller.get("key"),
+                "caller_func": caller.get("function_name"),
+                "caller_name": caller.get("name"),
+                "caller_class": caller.get("class_name"),
+                "caller_file": caller.get("file_path"),
+                "caller_type": caller.get("type"),
+                "callee_key": callee.get("key"),
+                "callee_func": callee.get("function_name"),
+                "callee_name": callee.get("name"),
+                "callee_class": callee.get("class_name"),
+                "callee_file": callee.get("file_path"),
+                "callee_type": callee.get("type"),
+                "call_props": raw["call_props"],
             }
             edges.append(edge)
-            print(f"\n  EDGE: {rec['caller_func'] or rec['caller_name']} -> {rec['callee_func'] or rec['callee_name']}")
-            print(f"    Caller: key={rec['caller_key']}, type={rec['caller_type']}, class={rec['caller_class']}")
-            print(f"      func_name={rec['caller_func']}, name={rec['caller_name']}")
-            print(f"      file={rec['caller_file']}")
-            print(f"    Callee: key={rec['callee_key']}, type={rec['callee_type']}, class={rec['callee_class']}")
-            print(f"      func_name={rec['callee_func']}, name={rec['callee_name']}")
-            print(f"      file={rec['callee_file']}")
-            if rec["call_props"]:
-                print(f"    Props: {rec['call_props']}")
+            print(f"\n  EDGE: {edge['caller_func'] or edge['caller_name']} -> {edge['callee_func'] or edge['callee_name']}")
+            print(f"    Caller: key={edge['caller_key']}, type={edge['caller_type']}, class={edge['caller_class']}")
+            print(f"      func_name={edge['caller_func']}, name={edge['caller_name']}")
+            print(f"      file={edge['caller_file']}")
+            print(f"    Callee: key={edge['callee_key']}, type={edge['callee_type']}, class={edge['callee_class']}")
+            print(f"      func_name={edge['callee_func']}, name={edge['callee_name']}")
+            print(f"      file={edge['callee_file']}")
+            if edge["call_props"]:
+                print(f"    Props: {edge['call_props']}")
 
         print(f"\n  Total edges: {len(edges)}")
 
-        # 4. Identify ROOT snippet
+        # 4. Identify ROOT snippet (from the already-fetched snippets)
         print("\n" + "=" * 80)
         print("STEP 4: ROOT identification")
         print("=" * 80)
-        result = await session.run("""
-            MATCH (ef:ExecutionFlow {key: $key})<-[r:PARTICIPATES_IN_FLOW]-(s:Snippet)
-            WHERE s.type = 'ROOT' AND r.STARTS_FLOW = true
-            RETURN s.key as key, s.function_name as func, s.name as name,
-                   s.class_name as cls, s.file_path as file, s.type as type
-            LIMIT 1
-        """, key=FLOW_KEY)
-        root_rec = await result.single()
-        if root_rec:
+        root = next(
+            (s for s in snippets if s["type"] == "ROOT" and s["starts_flow"]), None
+        )
+        if root:
             print(f"  ROOT found:")
-            print(f"    key:           {root_rec['key']}")
-            print(f"    function_name: {root_rec['func']}")
-            print(f"    name:          {root_rec['name']}")
-            print(f"    class_name:    {root_rec['cls']}")
-            print(f"    file_path:     {root_rec['file']}")
+            print(f"    key:           {root['key']}")
+            print(f"    function_name: {root['function_name']}")
+            print(f"    name:          {root['name']}")
+            print(f"    class_name:    {root['class_name']}")
+            print(f"    file_path:     {root['file_path']}")
         else:
             print("  NO ROOT snippet found (type='ROOT' AND STARTS_FLOW=true)")
-            # Try finding any STARTS_FLOW snippet
-            result2 = await session.run("""
-                MATCH (ef:ExecutionFlow {key: $key})<-[r:PARTICIPATES_IN_FLOW]-(s:Snippet)
-                WHERE r.STARTS_FLOW = true
-                RETURN s.key as key, s.function_name as func, s.name as name,
-                       s.class_name as cls, s.file_path as file, s.type as type
-            """, key=FLOW_KEY)
-            async for r2 in result2:
-                print(f"  STARTS_FLOW snippet (not ROOT type):")
-                print(f"    key={r2['key']}, type={r2['type']}")
-                print(f"    func={r2['func']}, name={r2['name']}")
-
-    await driver.close()
+            # Fall back to any STARTS_FLOW snippet
+            for s in snippets:
+                if s["starts_flow"]:
+                    print(f"  STARTS_FLOW snippet (not ROOT type):")
+                    print(f"    key={s['key']}, type={s['type']}")
+                    print(f"    func={s['function_name']}, name={s['name']}")
+
     print("\n\nDone.")
 
 
@@ -3,7 +3,7 @@ import asyncio
 import sqlite3
 import sys
 from pathlib import Path
-from neo4j import AsyncGraphDatabase
+from _neo4j_client import ensure_indexes, get_driver, read_session
 
 sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
@@ -14,29 +14,50 @@ FLOW_KEY = "59bb4d36-b166-4b82-826a-c31e191b1c66"
 DB_PATH = Path("sample_codebase/.trustbot_git_index.db")
 
 
-async def neo4j_data():
-    driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+async def neo4j_data(keys: list[str]) -> dict[str, list[dict]]:
+    """Fetch snippets/edges for a batch of flow keys in one UNWIND query."""
+    driver = get_driver(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
     await driver.verify_connectivity()
-
-    async with driver.session() as session:
-        # ExecutionFlow
-        result = await session.run(
-            "MATCH (ef:ExecutionFlow {key: $key}) RETURN ef.name as name", key=FLOW_KEY)
-        rec = await result.single()
+    await ensure_indexes(driver)
+
+    # UNWIND batches any number of flow keys through one cached query plan
+    # and one round-trip; the root is derived from the snippet list in Python.
+    query = """
+        UNWIND $keys AS k
+        MATCH (ef:ExecutionFlow {key: k})
+        OPTIONAL MATCH (ef)<-[r:PARTICIPATES_IN_FLOW]-(s:Snippet)
+        WITH k, ef, collect({key: s.key, type: s.type, func: s.function_name,
+                             name: s.name, cls: s.class_name, file: s.file_path,
+                             fname: s.file_name, starts: r.STARTS_FLOW}) AS snippets
+        OPTIONAL MATCH (ef)<-[:PARTICIPATES_IN_FLOW]-(caller:Snippet)-[c:CALLS]->(callee:Snippet)
+        RETURN k, ef.name AS name, snippets,
+               collect({caller_func: caller.function_name, caller_name: caller.name,
+                        callee_func: callee.function_name, callee_name: callee.name}) AS calls
+    """
+
+    async def run_batch(batch):
+        async with read_session(driver) as session:
+            result = await session.run(query, keys=batch)
+            return await result.data()
+
+    # Large key batches are split across sessions and gathered so the server
+    # traverses the flows concurrently; end-to-end latency approaches the
+    # slowest batch instead of the sum
+    batches = [keys[i:i + 25] for i in range(0, len(keys), 25)]
+    flows: dict[str, list[dict]] = {}
+    records = [
+        rec
+        for batch_records in await asyncio.gather(*map(run_batch, batches))
+        for rec in batch_records
+    ]
+
+    for rec in records:
         print(f"ExecutionFlow: {rec['name']}\n")
 
-        # All snippets
-        result = await session.run("""
-            MATCH (ef:ExecutionFlow {key: $key})<-[r:PARTICIPATES_IN_FLOW]-(s:Snippet)
-            RETURN s.key as key, s.type as type, s.function_name as func,
-                   s.name as name, s.class_name as cls, s.file_path as file,
-                   s.file_name as fname, r.STARTS_FLOW as starts
-            ORDER BY r.STARTS_FLOW DESC
-        """, key=FLOW_KEY)
+        snippets = [s for s in rec["snippets"] if s["key"] is not None]
+        snippets.sort(key=lambda s: not s["starts"])
         print("SNIPPETS:")
-        snippets = []
-        async for r in result:
-            snippets.append(dict(r))
+        for r in snippets:
             root_tag = " *** ROOT ***" if r["type"] == "ROOT" else ""
             start_tag = " [STARTS_FLOW]" if r["starts"] else ""
             print(f"  key={r['key']}")
@@ -48,43 +69,28 @@ async def neo4j_data():
             print(f"    file_path={r['file']}")
             print()
 
-        # CALLS edges
-        result = await session.run("""
-            MATCH (ef:ExecutionFlow {key: $key})<-[:PARTICIPATES_IN_FLOW]-(caller:Snippet)
-            MATCH (caller)-[c:CALLS]->(callee:Snippet)
-            RETURN caller.function_name as caller_func, caller.name as caller_name,
-                   callee.function_name as callee_func, callee.name as callee_name
-        """, key=FLOW_KEY)
         print("CALLS EDGES:")
-        async for r in result:
+        for r in rec["calls"]:
+            if r["caller_func"] is None and r["caller_name"] is None:
+                continue
             cf = r['caller_func'] or r['caller_name']
             ce = r['callee_func'] or r['callee_name']
             print(f"  {cf} -> {ce}")
 
-        # How Agent 1 picks root
-        result = await session.run("""
-            MATCH (ef:ExecutionFlow {key: $key})<-[r:PARTICIPATES_IN_FLOW]-(s:Snippet)
-            WHERE s.type = 'ROOT' AND r.STARTS_FLOW = true
-            RETURN s.function_name as func, s.name as name, s.class_name as cls
-            LIMIT 1
-        """, key=FLOW_KEY)
-        root = await result.single()
+        # How Agent 1 picks root (same precedence, computed locally)
+        root = next((s for s in snippets if s["type"] == "ROOT" and s["starts"]), None)
         if root:
-            root_func = root['func'] or root['name']
             print(f"\nAgent 1 ROOT: function_name='{root['func']}', name='{root['name']}', class='{root['cls']}'")
             print(f"  -> Agent 1 will use: '{root['func'] or root['name']}' as root_function")
         else:
             print("\nNo ROOT snippet found. Checking entry_points...")
-            result2 = await session.run("""
-                MATCH (ef:ExecutionFlow {key: $key})<-[r:PARTICIPATES_IN_FLOW]-(s:Snippet)
-                WHERE r.STARTS_FLOW = true
-                RETURN s.function_name as func, s.name as name
-            """, key=FLOW_KEY)
-            async for r2 in result2:
-                print(f"  STARTS_FLOW: func={r2['func']}, name={r2['name']}")
+            for r2 in snippets:
+                if r2["starts"]:
+                    print(f"  STARTS_FLOW: func={r2['func']}, name={r2['name']}")
+
+        flows[rec["k"]] = snippets
 
-    await driver.close()
-    return snippets
+    return flows
 
 
 def check_index(root_name):
@@ -93,7 +99,21 @@ def check_index(root_name):
         return
 
     conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+    # Tuple rows skip the sqlite3.Row wrapper; pragmas keep the index in
+    # memory for these ad-hoc scans
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+    # Idempotent indexes: the NOCASE collation lets the case-insensitive
+    # probe use an index seek instead of a LOWER() full scan
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_code_index_fname_nocase "
+        "ON code_index(function_name COLLATE NOCASE)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_code_index_file_path ON code_index(file_path)"
+    )
 
     print(f"\n{'='*60}")
     print(f"CHECKING INDEX FOR ROOT: '{root_name}'")
@@ -104,46 +124,48 @@ def check_index(root_name):
         "SELECT function_name, file_path, class_name FROM code_index WHERE function_name = ?",
         (root_name,)).fetchall()
     print(f"\n  Exact match for '{root_name}': {len(rows)}")
-    for r in rows:
-        print(f"    {r['function_name']} | {r['class_name']} | {r['file_path']}")
+    for fn, fp, cls in rows:
+        print(f"    {fn} | {cls} | {fp}")
 
     # Case-insensitive
     rows = conn.execute(
-        "SELECT function_name, file_path, class_name FROM code_index WHERE LOWER(function_name) = LOWER(?)",
+        "SELECT function_name, file_path, class_name FROM code_index "
+        "WHERE function_name = ? COLLATE NOCASE",
         (root_name,)).fetchall()
     print(f"\n  Case-insensitive for '{root_name}': {len(rows)}")
-    for r in rows:
-        print(f"    {r['function_name']} | {r['class_name']} | {r['file_path']}")
+    for fn, fp, cls in rows:
+        print(f"    {fn} | {cls} | {fp}")
 
     # Substring/LIKE match
     rows = conn.execute(
         "SELECT function_name, file_path, class_name FROM code_index WHERE function_name LIKE ?",
         (f"%{root_name}%",)).fetchall()
     print(f"\n  LIKE '%{root_name}%': {len(rows)}")
-    for r in rows:
-        print(f"    {r['function_name']} | {r['class_name']} | {r['file_path']}")
+    for fn, fp, cls in rows:
+        print(f"    {fn} | {cls} | {fp}")
 
     # Check what IS in Unit1.pas
     rows = conn.execute(
         "SELECT function_name, file_path, class_name FROM code_index WHERE file_path LIKE '%Unit1%'"
     ).fetchall()
     print(f"\n  Functions in any file containing 'Unit1': {len(rows)}")
-    for r in rows:
-        print(f"    {r['function_name']} | {r['class_name']} | {r['file_path']}")
+    for fn, fp, cls in rows:
+        print(f"    {fn} | {cls} | {fp}")
 
     # Show all unique function names containing 'Form'
     rows = conn.execute(
         "SELECT DISTINCT function_name, file_path FROM code_index WHERE function_name LIKE '%Form%'"
     ).fetchall()
     print(f"\n  Functions containing 'Form': {len(rows)}")
-    for r in rows:
-        print(f"    {r['function_name']} | {r['file_path']}")
+    for fn, fp in rows:
+        print(f"    {fn} | {fp}")
 
     conn.close()
 
 
 async def main():
-    snippets = await neo4j_data()
+    flows = await neo4j_data([FLOW_KEY])
+    snippets = flows.get(FLOW_KEY, [])
 
     # Find the root function name Agent 1 would use
     root_snippet = None
@@ -1,10 +1,24 @@
 """
 Debug script: Check what the code index has for the functions in this flow.
 """
+import io
 import sqlite3
 import sys
 from pathlib import Path
 
+# The full function/edge listings can run to thousands of lines; buffer them
+# and hit stdout once instead of locking and flushing per print
+_out = io.StringIO()
+
+
+def echo(*args):
+    print(*args, file=_out)
+
+
+def flush_output():
+    sys.stdout.write(_out.getvalue())
+    sys.stdout.flush()
+
 DB_PATH = Path("sample_codebase/.trustbot_git_index.db")
 
 if not DB_PATH.exists():
@@ -13,57 +27,73 @@ if not DB_PATH.exists():
     sys.exit(1)
 
 conn = sqlite3.connect(str(DB_PATH))
-conn.row_factory = sqlite3.Row
+# Keep the whole index in memory for these ad-hoc scans; plain tuple rows
+# skip the per-row sqlite3.Row wrapper
+conn.execute("PRAGMA mmap_size=268435456")
+conn.execute("PRAGMA cache_size=-65536")
+conn.execute("PRAGMA temp_store=MEMORY")
 
-print("=" * 80)
-print("ALL INDEXED FUNCTIONS (code_index table)")
-print("=" * 80)
+# Idempotent index so the case-insensitive lookup below is a seek, not a scan
+conn.execute(
+    "CREATE INDEX IF NOT EXISTS idx_code_index_fname_nocase "
+    "ON code_index(function_name COLLATE NOCASE)"
+)
+
+echo("=" * 80)
+echo("ALL INDEXED FUNCTIONS (code_index table)")
+echo("=" * 80)
 rows = conn.execute("SELECT function_name, file_path, class_name, language FROM code_index ORDER BY function_name").fetchall()
-print(f"Total: {len(rows)} functions\n")
-for r in rows:
-    print(f"  {r['function_name']:40s} | {r['class_name'] or '-':20s} | {r['file_path']}")
+echo(f"Total: {len(rows)} functions\n")
+for fn, fp, cls, _lang in rows:
+    echo(f"  {fn:40s} | {cls or '-':20s} | {fp}")
 
-print("\n" + "=" * 80)
-print("SEARCHING FOR: InitialiseEcran, ChargeArborescence")
-print("=" * 80)
-for name in ["InitialiseEcran", "ChargeArborescence"]:
-    exact = conn.execute(
-        "SELECT * FROM code_index WHERE function_name = ?", (name,)
-    ).fetchall()
-    icase = conn.execute(
-        "SELECT * FROM code_index WHERE LOWER(function_name) = LOWER(?)", (name,)
-    ).fetchall()
-    print(f"\n  '{name}':")
-    print(f"    Exact match: {len(exact)} rows")
-    for r in exact:
-        print(f"      -> file={r['file_path']}, class={r['class_name']}")
-    print(f"    Case-insensitive: {len(icase)} rows")
-    for r in icase:
-        print(f"      -> file={r['file_path']}, class={r['class_name']}")
+echo("\n" + "=" * 80)
+echo("SEARCHING FOR: InitialiseEcran, ChargeArborescence")
+echo("=" * 80)
+# One IN query fetches candidates for every searched name; exact vs
+# case-insensitive is attributed per name in Python afterwards
+names = ["InitialiseEcran", "ChargeArborescence"]
+placeholders = ",".join("?" * len(names))
+candidates = conn.execute(
+    f"SELECT function_name, file_path, class_name FROM code_index "
+    f"WHERE function_name COLLATE NOCASE IN ({placeholders})",
+    names,
+).fetchall()
+for name in names:
+    exact = [(fp, cls) for fn, fp, cls in candidates if fn == name]
+    icase = [(fp, cls) for fn, fp, cls in candidates if fn.lower() == name.lower()]
+    echo(f"\n  '{name}':")
+    echo(f"    Exact match: {len(exact)} rows")
+    for fp, cls in exact:
+        echo(f"      -> file={fp}, class={cls}")
+    echo(f"    Case-insensitive: {len(icase)} rows")
+    for fp, cls in icase:
+        echo(f"      -> file={fp}, class={cls}")
 
-print("\n" + "=" * 80)
-print("ALL CALL EDGES (call_edges table)")
-print("=" * 80)
+echo("\n" + "=" * 80)
+echo("ALL CALL EDGES (call_edges table)")
+echo("=" * 80)
 edges = conn.execute("SELECT caller, callee, confidence FROM call_edges ORDER BY caller").fetchall()
-print(f"Total: {len(edges)} edges\n")
-for e in edges:
-    print(f"  {e['caller']}")
-    print(f"    -> {e['callee']}  (conf={e['confidence']})")
-    print()
+echo(f"Total: {len(edges)} edges\n")
+for caller, callee, confidence in edges:
+    echo(f"  {caller}")
+    echo(f"    -> {callee}  (conf={confidence})")
+    echo()
 
 # Search for edges involving our functions
-print("=" * 80)
-print("EDGES involving InitialiseEcran or ChargeArborescence")
-print("=" * 80)
+echo("=" * 80)
+echo("EDGES involving InitialiseEcran or ChargeArborescence")
+echo("=" * 80)
 for name in ["InitialiseEcran", "ChargeArborescence"]:
     pattern = f"%{name}%"
     matching = conn.execute(
-        "SELECT * FROM call_edges WHERE caller LIKE ? OR callee LIKE ?",
+        "SELECT caller, callee, confidence FROM call_edges WHERE caller LIKE ? OR callee LIKE ?",
         (pattern, pattern),
     ).fetchall()
-    print(f"\n  Edges containing '{name}': {len(matching)}")
-    for e in matching:
-        print(f"    {e['caller']} -> {e['callee']} (conf={e['confidence']})")
+    echo(f"\n  Edges containing '{name}': {len(matching)}")
+    for caller, callee, confidence in matching:
+        echo(f"    {caller} -> {callee} (conf={confidence})")
 
 conn.close()
-print("\nDone.")
+echo("\nDone.")
+flush_output()
@@ -13,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 load_dotenv()
 
-from neo4j import AsyncGraphDatabase
+from _neo4j_client import ensure_indexes, get_driver, read_session
 from trustbot.config import settings
 
 KEY = "28363924-96fc-40e8-87bc-2c725be91e18"
@@ -21,19 +21,17 @@ KEY = "28363924-96fc-40e8-87bc-2c725be91e18"
 
 async def main():
     print(f"Connecting to Neo4j at {settings.neo4j_uri}...")
-    driver = AsyncGraphDatabase.driver(
-        settings.neo4j_uri,
-        auth=(settings.neo4j_user, settings.neo4j_password),
-    )
+    driver = get_driver(settings.neo4j_uri, settings.neo4j_user, settings.neo4j_password)
 
     try:
         await driver.verify_connectivity()
+        await ensure_indexes(driver)
         print("Connected successfully!\n")
     except Exception as e:
         print(f"Connection failed: {e}")
         return
 
-    async with driver.session() as session:
+    async with read_session(driver) as session:
 
         # Step 1: Fetch the ExecutionFlow node
         print(f"=== Step 1: ExecutionFlow node ===")
@@ -61,17 +59,19 @@ async def main():
             """
             MATCH (ef:ExecutionFlow {key: $key})-[r]->(m)
             RETURN type(r) as rel_type, properties(r) as rel_props,
-                   labels(m) as target_labels, properties(m) as target_props
+                   labels(m) as target_labels,
+                   m.key as target_key, coalesce(m.name, m.function_name, '?') as target_name
             """,
             key=KEY,
         )
-        records = [record async for record in result]
+        # data() drains the buffered result in one call (no per-record
+        # coroutine resume) and yields plain dicts
+        records = await result.data()
         print(f"Outgoing: {len(records)}")
         for r in records:
-            tp = dict(r["target_props"])
             print(f"  -[{r['rel_type']}]-> {r['target_labels']}")
-            print(f"    key={tp.get('key', '?')}, name={tp.get('name', tp.get('function_name', '?'))}")
-            rel_props = dict(r["rel_props"]) if r["rel_props"] else {}
+            print(f"    key={r['target_key'] or '?'}, name={r['target_name']}")
+            rel_props = r["rel_props"] or {}
             if rel_props:
                 print(f"    rel props: {json.dumps(rel_props, default=str)}")
 
@@ -81,17 +81,19 @@ async def main():
             """
             MATCH (ef:ExecutionFlow {key: $key})<-[r]-(m)
             RETURN type(r) as rel_type, properties(r) as rel_props,
-                   labels(m) as source_labels, properties(m) as source_props
+                   labels(m) as source_labels,
+                   m.key as source_key, coalesce(m.name, m.function_name, '?') as source_name
             """,
             key=KEY,
         )
-        records = [record async for record in result]
+        # data() drains the buffered result in one call (no per-record
+        # coroutine resume) and yields plain dicts
+        records = await result.data()
         print(f"Incoming: {len(records)}")
         for r in records:
-            sp = dict(r["source_props"])
             print(f"  <-[{r['rel_type']}]- {r['source_labels']}")
-            print(f"    key={sp.get('key', '?')}, name={sp.get('name', sp.get('function_name', '?'))}")
-            rel_props = dict(r["rel_props"]) if r["rel_props"] else {}
+            print(f"    key={r['source_key'] or '?'}, name={r['source_name']}")
+            rel_props = r["rel_props"] or {}
             if rel_props:
                 print(f"    rel props: {json.dumps(rel_props, default=str)}")
 
@@ -100,16 +102,24 @@ async def main():
         result = await session.run(
             """
             MATCH (ef:ExecutionFlow {key: $key})<-[r:PARTICIPATES_IN_FLOW]-(s)
-            RETURN labels(s) as labels, properties(r) as rel_props, properties(s) as snippet_props
+            RETURN labels(s) as labels, properties(r) as rel_props,
+                   {key: s.key, function_name: s.function_name, name: s.name,
+                    class_name: s.class_name, file_path: s.file_path,
+                    language: s.language, line_start: s.line_start,
+                    line_end: s.line_end, type: s.type, module_name: s.module_name,
+                    source_file: s.source_file, STARTS_FLOW: s.STARTS_FLOW,
+                    starts_flow: s.starts_flow, file_name: s.file_name} as snippet_props
             ORDER BY r.order
             """,
             key=KEY,
         )
-        records = [record async for record in result]
+        # data() drains the buffered result in one call (no per-record
+        # coroutine resume) and yields plain dicts
+        records = await result.data()
         print(f"Participants: {len(records)}")
         for r in records:
-            sp = dict(r["snippet_props"])
-            rp = dict(r["rel_props"]) if r["rel_props"] else {}
+            sp = r["snippet_props"]
+            rp = r["rel_props"] or {}
             print(f"  Labels: {r['labels']}")
             print(f"    Rel props: {json.dumps(rp, default=str)}")
             # Print key snippet properties
@@ -127,22 +137,22 @@ async def main():
             """
             MATCH (ef:ExecutionFlow {key: $key})<-[:PARTICIPATES_IN_FLOW]-(s)
             OPTIONAL MATCH (s)-[c:CALLS]->(target)
-            RETURN properties(s) as caller_props, labels(s) as caller_labels,
+            RETURN coalesce(s.function_name, s.name, '?') as caller_name,
                    type(c) as call_type, properties(c) as call_props,
-                   properties(target) as callee_props, labels(target) as callee_labels
+                   CASE WHEN target IS NULL THEN null
+                        ELSE coalesce(target.function_name, target.name, '?') END as callee_name
             """,
             key=KEY,
         )
-        records = [record async for record in result]
+        # data() drains the buffered result in one call (no per-record
+        # coroutine resume) and yields plain dicts
+        records = await result.data()
         print(f"Call relationships: {len(records)}")
         for r in records:
-            cp = dict(r["caller_props"])
-            caller_name = cp.get("function_name", cp.get("name", "?"))
-            if r["callee_props"]:
-                tp = dict(r["callee_props"])
-                callee_name = tp.get("function_name", tp.get("name", "?"))
-                call_props = dict(r["call_props"]) if r["call_props"] else {}
-                print(f"  {caller_name} -[{r['call_type']}]-> {callee_name}")
+            caller_name = r["caller_name"]
+            if r["callee_name"] is not None:
+                call_props = r["call_props"] or {}
+                print(f"  {caller_name} -[{r['call_type']}]-> {r['callee_name']}")
                 if call_props:
                     print(f"    call props: {json.dumps(call_props, default=str)}")
             else:
@@ -168,7 +178,6 @@ async def main():
                     val_str = val_str[:200] + "..."
                 print(f"  {k}: {val_str}")
 
-    await driver.close()
     print("\nDone.")
 
 
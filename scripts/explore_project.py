@@ -10,7 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 load_dotenv()
 
-from neo4j import AsyncGraphDatabase
+from _neo4j_client import ensure_indexes, get_driver, read_session
 from trustbot.config import settings
 
 PROJECT_ID = 3151
@@ -18,24 +18,28 @@ RUN_ID = 4912
 
 
 async def main():
-    driver = AsyncGraphDatabase.driver(
-        settings.neo4j_uri,
-        auth=(settings.neo4j_user, settings.neo4j_password),
-    )
+    driver = get_driver(settings.neo4j_uri, settings.neo4j_user, settings.neo4j_password)
     await driver.verify_connectivity()
+    await ensure_indexes(driver)
     print(f"Connected. Querying project_id={PROJECT_ID}, run_id={RUN_ID}\n")
 
-    async with driver.session() as session:
-        # Count ExecutionFlow nodes
+    async with read_session(driver) as session:
+        # One traversal of the ExecutionFlow subgraph serves all the counts
+        # instead of three queries that each re-match PARTICIPATES_IN_FLOW
         result = await session.run(
             """
             MATCH (ef:ExecutionFlow {project_id: $pid, run_id: $rid})
-            RETURN count(ef) as total
+            OPTIONAL MATCH (ef)<-[:PARTICIPATES_IN_FLOW]-(s:Snippet)
+            OPTIONAL MATCH (s)-[c:CALLS]->(:Snippet)
+            RETURN count(DISTINCT ef) as total,
+                   count(DISTINCT s) as snippet_count,
+                   count(DISTINCT CASE WHEN s IS NOT NULL THEN ef END) as flow_count,
+                   count(c) as call_count
             """,
             pid=PROJECT_ID, rid=RUN_ID,
         )
-        record = await result.single()
-        print(f"Total ExecutionFlow nodes: {record['total']}\n")
+        counts = await result.single()
+        print(f"Total ExecutionFlow nodes: {counts['total']}\n")
 
         # List them with key info
         result = await session.run(
@@ -48,40 +52,18 @@ async def main():
             """,
             pid=PROJECT_ID, rid=RUN_ID,
         )
-        records = [record async for record in result]
+        # data() drains the buffered result in one call (no per-record
+        # coroutine resume) and yields plain dicts
+        records = await result.data()
         print(f"First {len(records)} ExecutionFlows:")
         for r in records:
             print(f"  [{r['flow_type']}] {r['name']} (module: {r['module']}, complexity: {r['complexity']})")
             print(f"    key: {r['key']}")
 
-        # Count Snippets linked to these flows
-        result = await session.run(
-            """
-            MATCH (ef:ExecutionFlow {project_id: $pid, run_id: $rid})
-                  <-[:PARTICIPATES_IN_FLOW]-(s:Snippet)
-            RETURN count(DISTINCT s) as snippet_count,
-                   count(DISTINCT ef) as flow_count
-            """,
-            pid=PROJECT_ID, rid=RUN_ID,
-        )
-        record = await result.single()
-        print(f"\nTotal unique Snippets across all flows: {record['snippet_count']}")
-        print(f"Flows with at least 1 Snippet: {record['flow_count']}")
-
-        # Count CALLS edges
-        result = await session.run(
-            """
-            MATCH (ef:ExecutionFlow {project_id: $pid, run_id: $rid})
-                  <-[:PARTICIPATES_IN_FLOW]-(s:Snippet)
-                  -[c:CALLS]->(target:Snippet)
-            RETURN count(c) as call_count
-            """,
-            pid=PROJECT_ID, rid=RUN_ID,
-        )
-        record = await result.single()
-        print(f"Total CALLS edges: {record['call_count']}")
+        print(f"\nTotal unique Snippets across all flows: {counts['snippet_count']}")
+        print(f"Flows with at least 1 Snippet: {counts['flow_count']}")
+        print(f"Total CALLS edges: {counts['call_count']}")
 
-    await driver.close()
     print("\nDone.")
 
 
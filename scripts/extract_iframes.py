@@ -1,63 +1,84 @@
 #!/usr/bin/env python
 """Extract and analyze iframe content from the saved HTML."""
 
+import asyncio
+import functools
+import html
 import re
 from pathlib import Path
 
-html_file = Path("data/ui_analysis/full_page.html")
-output_dir = Path("data/ui_analysis")
+# Patterns compiled once at module scope; character classes ([^&]*, [^<]*,
+# [^`]+) cannot backtrack, so each scan stays linear in input size
+IFRAME_RE = re.compile(r'<iframe[^>]*srcdoc=&quot;([^&]*)&quot;', re.DOTALL)
+MERMAID_RE = re.compile(r'<pre class="mermaid">([^<]*)</pre>', re.DOTALL)
+CODE_BLOCK_RE = re.compile(r'```([^`]+)```')
 
-with open(html_file, 'r', encoding='utf-8') as f:
-    content = f.read()
+# Pages commonly repeat identical srcdoc payloads; memoizing skips the
+# pure-Python entity decode for duplicates
+_unescape = functools.lru_cache(maxsize=None)(html.unescape)
 
-# Find iframes with srcdoc
-iframe_pattern = r'<iframe[^>]*srcdoc=&quot;([^&]*)&quot;'
-matches = re.findall(iframe_pattern, content, re.DOTALL)
+async def main():
+    html_file = Path("data/ui_analysis/full_page.html")
+    output_dir = Path("data/ui_analysis")
 
-print(f"Found {len(matches)} iframe(s) with srcdoc")
+    content = html_file.read_text(encoding='utf-8')
 
-for i, match in enumerate(matches, 1):
-    # Decode HTML entities
-    import html
-    decoded = html.unescape(match)
+    outputs: list[tuple[Path, str]] = []
+
+    # Find iframes with srcdoc
+    matches = IFRAME_RE.findall(content)
+
+    print(f"Found {len(matches)} iframe(s) with srcdoc")
+
+    for i, match in enumerate(matches, 1):
+        # Decode HTML entities
+        decoded = _unescape(match)
+        decoded_lower = decoded.lower()
     
-    iframe_file = output_dir / f"iframe_{i}.html"
-    with open(iframe_file, 'w', encoding='utf-8') as f:
-        f.write(decoded)
+        iframe_file = output_dir / f"iframe_{i}.html"
+        outputs.append((iframe_file, decoded))
     
-    print(f"\nIframe {i}:")
-    print(f"  Length: {len(decoded)} chars")
-    print(f"  Has Mermaid: {'mermaid' in decoded.lower()}")
-    print(f"  Has Mermaid CDN: {'cdn.jsdelivr.net' in decoded}")
-    print(f"  Has graph TD: {'graph TD' in decoded}")
-    print(f"  Has flowchart: {'flowchart' in decoded}")
-    print(f"  Saved to: {iframe_file}")
+        print(f"\nIframe {i}:")
+        print(f"  Length: {len(decoded)} chars")
+        print(f"  Has Mermaid: {'mermaid' in decoded_lower}")
+        print(f"  Has Mermaid CDN: {'cdn.jsdelivr.net' in decoded_lower}")
+        print(f"  Has graph TD: {'graph TD' in decoded}")
+        print(f"  Has flowchart: {'flowchart' in decoded_lower}")
+        print(f"  Saved to: {iframe_file}")
     
-    # Extract Mermaid code
-    mermaid_pattern = r'<pre class="mermaid">([^<]*)</pre>'
-    mermaid_matches = re.findall(mermaid_pattern, decoded, re.DOTALL)
-    if mermaid_matches:
-        print(f"  Found {len(mermaid_matches)} Mermaid diagram(s)")
-        for j, mermaid_code in enumerate(mermaid_matches, 1):
-            print(f"\n    Mermaid {j} (first 150 chars):")
-            print(f"    {mermaid_code[:150]}")
-
-# Search for text call trees in code blocks
-code_block_pattern = r'```([^`]+)```'
-code_blocks = re.findall(code_block_pattern, content)
-
-print(f"\n\nFound {len(code_blocks)} code block(s) with triple backticks")
-
-for i, block in enumerate(code_blocks[:5], 1):
-    if '[ROOT]' in block or '|--' in block or '├──' in block:
-        print(f"\nCode block {i} contains tree structure (first 200 chars):")
-        print(block[:200])
+        # Extract Mermaid code
+        mermaid_matches = MERMAID_RE.findall(decoded)
+        if mermaid_matches:
+            print(f"  Found {len(mermaid_matches)} Mermaid diagram(s)")
+            for j, mermaid_code in enumerate(mermaid_matches, 1):
+                print(f"\n    Mermaid {j} (first 150 chars):")
+                print(f"    {mermaid_code[:150]}")
+
+    # Search for text call trees in code blocks
+    code_blocks = CODE_BLOCK_RE.findall(content)
+
+    print(f"\n\nFound {len(code_blocks)} code block(s) with triple backticks")
+
+    for i, block in enumerate(code_blocks[:5], 1):
+        if '[ROOT]' in block or '|--' in block or '├──' in block:
+            print(f"\nCode block {i} contains tree structure (first 200 chars):")
+            print(block[:200])
         
-        # Save it
-        tree_file = output_dir / f"text_tree_{i}.txt"
-        with open(tree_file, 'w', encoding='utf-8') as f:
-            f.write(block)
-        print(f"  Saved to: {tree_file}")
-
-print("\n" + "="*60)
-print("Analysis complete!")
+            # Save it
+            tree_file = output_dir / f"text_tree_{i}.txt"
+            outputs.append((tree_file, block))
+            print(f"  Saved to: {tree_file}")
+
+    print("\n" + "="*60)
+    print("Analysis complete!")
+
+    # Flush all decoded files concurrently; overlaps disk latency across
+    # outputs instead of serializing one write per iframe
+    await asyncio.gather(
+        *(asyncio.to_thread(path.write_text, text, encoding="utf-8")
+          for path, text in outputs)
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -29,6 +29,10 @@ async def main() -> int:
     output_dir = Path("data/text_extracts")
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Writes are queued and flushed concurrently at the end so disk latency
+    # overlaps with the browser work instead of blocking the event loop
+    outputs: list[tuple[Path, str]] = []
+
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
         context = await browser.new_context(viewport={"width": 1920, "height": 1200})
@@ -37,12 +41,12 @@ async def main() -> int:
         try:
             print("Connecting...")
             await page.goto("http://localhost:7860", timeout=30000)
-            await asyncio.sleep(3)
+            await page.wait_for_load_state("networkidle")
 
             # Go to Validate tab
             validate_tab = page.locator("button[role='tab']:has-text('2. Validate')").first
             await validate_tab.click(force=True)
-            await asyncio.sleep(3)
+            await page.wait_for_selector("[role='tabpanel']:not([hidden])")
 
             # Extract summary
             print("\nExtracting Summary...")
@@ -54,8 +58,7 @@ async def main() -> int:
                 if len(await summary_elements.count()) > 0:
                     summary_text = await all_summaries[0].inner_text()
                     file_path = output_dir / "summary.txt"
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(summary_text)
+                    outputs.append((file_path, summary_text))
                     print(f"  Saved: {file_path}")
                     print(f"  Length: {len(summary_text)} chars")
                     print(f"  Preview:\n{summary_text[:300]}\n")
@@ -71,50 +74,51 @@ async def main() -> int:
                 ("Raw JSON", "raw_json"),
             ]
 
-            for accordion_name, safe_name in accordions:
-                print(f"\nExtracting {accordion_name}...")
+            # Expand every accordion first, then pull all their contents in
+            # ONE page.evaluate instead of a DOM scan per accordion
+            for accordion_name, _ in accordions:
                 try:
                     accordion = page.locator(f"text={accordion_name}").first
                     await accordion.click(force=True, timeout=5000)
-                    await asyncio.sleep(2)
-                    
-                    # Get the content after the accordion header
-                    # Find the parent accordion container and get all text
-                    content_text = await page.evaluate("""
-                        () => {
-                            const accordions = document.querySelectorAll('[class*="accordion"]');
-                            for (let acc of accordions) {
-                                if (acc.textContent.includes('""" + accordion_name + """')) {
-                                    return acc.textContent;
-                                }
-                            }
-                            return "";
-                        }
-                    """)
-                    
-                    file_path = output_dir / f"{safe_name}.txt"
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(content_text)
-                    
-                    print(f"  Saved: {file_path}")
-                    print(f"  Length: {len(content_text)} chars")
-                    
-                    # Check for key patterns
-                    has_iframe = "<iframe" in content_text.lower()
-                    has_mermaid = "mermaid" in content_text.lower()
-                    has_root = "[ROOT]" in content_text
-                    has_tree = "|--" in content_text or "├──" in content_text
-                    
-                    print(f"  Has iframe ref: {has_iframe}")
-                    print(f"  Has mermaid ref: {has_mermaid}")
-                    print(f"  Has [ROOT]: {has_root}")
-                    print(f"  Has tree chars: {has_tree}")
-                    
-                    if len(content_text) > 100:
-                        print(f"  Preview:\n{content_text[:200]}\n")
-                    
                 except Exception as e:
-                    print(f"  Error: {e}")
+                    print(f"  Could not expand {accordion_name}: {e}")
+            await page.wait_for_load_state("networkidle")
+
+            accordion_texts: list[str] = await page.evaluate(
+                """() => [...document.querySelectorAll('[class*="accordion"]')]
+                        .map(acc => acc.textContent)"""
+            )
+
+            for accordion_name, safe_name in accordions:
+                print(f"\nExtracting {accordion_name}...")
+                content_text = next(
+                    (t for t in accordion_texts if accordion_name in t), ""
+                )
+
+                file_path = output_dir / f"{safe_name}.txt"
+                outputs.append((file_path, content_text))
+
+                print(f"  Saved: {file_path}")
+                print(f"  Length: {len(content_text)} chars")
+
+                # Check for key patterns
+                has_iframe = "<iframe" in content_text.lower()
+                has_mermaid = "mermaid" in content_text.lower()
+                has_root = "[ROOT]" in content_text
+                has_tree = "|--" in content_text or "├──" in content_text
+
+                print(f"  Has iframe ref: {has_iframe}")
+                print(f"  Has mermaid ref: {has_mermaid}")
+                print(f"  Has [ROOT]: {has_root}")
+                print(f"  Has tree chars: {has_tree}")
+
+                if len(content_text) > 100:
+                    print(f"  Preview:\n{content_text[:200]}\n")
+
+            await asyncio.gather(
+                *(asyncio.to_thread(path.write_text, text, encoding='utf-8')
+                  for path, text in outputs)
+            )
 
         finally:
             await browser.close()
@@ -1,8 +1,10 @@
 """Fetch DatabaseEntity + DatabaseField nodes from Neo4j for a given project_id."""
 
 import asyncio
-import json
-from neo4j import AsyncGraphDatabase
+from pathlib import Path
+
+import orjson
+from _neo4j_client import ensure_indexes, get_driver, read_session
 
 
 async def main():
@@ -11,22 +13,18 @@ async def main():
     password = "Rapidxneo4jdev"
     project_id = 976
 
-    driver = AsyncGraphDatabase.driver(uri, auth=(user, password))
+    driver = get_driver(uri, user, password)
     await driver.verify_connectivity()
+    await ensure_indexes(driver)
     print(f"Connected to Neo4j at {uri}")
 
-    # First, discover what run_ids exist for this project
+    # Discover run_ids and fetch all entities in one read transaction so both
+    # statements share a session/connection and pipeline over Bolt
     run_query = """
     MATCH (e:DatabaseEntity {project_id: $pid})
     RETURN DISTINCT e.run_id AS run_id
     ORDER BY e.run_id
     """
-    async with driver.session() as session:
-        result = await session.run(run_query, pid=project_id)
-        run_ids = [record["run_id"] async for record in result]
-    print(f"Run IDs for project_id={project_id}: {run_ids}")
-
-    # Fetch all entities with fields
     entity_query = """
     MATCH (e:DatabaseEntity {project_id: $pid})
     OPTIONAL MATCH (e)-[:HAS_FIELD]->(f:DatabaseField)
@@ -34,23 +32,24 @@ async def main():
     ORDER BY e.run_id, e.name
     """
 
-    entities = []
-    async with driver.session() as session:
-        result = await session.run(entity_query, pid=project_id)
-        async for record in result:
-            e = record["e"]
-            fields_raw = record["fields"]
+    async def fetch_all(tx):
+        result = await tx.run(run_query, pid=project_id)
+        # result.data() buffers the record set in one call (no per-record
+        # coroutine resume) and converts nodes to plain dicts
+        run_ids = [rec["run_id"] for rec in await result.data()]
+        result = await tx.run(entity_query, pid=project_id)
+        return run_ids, await result.data()
 
-            entity_props = dict(e)
-            fields = []
-            for f in fields_raw:
-                if f is not None:
-                    fields.append(dict(f))
+    # Export-sized result sets: big fetch_size minimizes PULL round-trips
+    async with read_session(driver, fetch_size=5000) as session:
+        run_ids, records = await session.execute_read(fetch_all)
 
-            entities.append({
-                "entity": entity_props,
-                "fields": fields,
-            })
+    print(f"Run IDs for project_id={project_id}: {run_ids}")
+
+    entities = [
+        {"entity": rec["e"], "fields": [f for f in rec["fields"] if f is not None]}
+        for rec in records
+    ]
 
     print(f"\nTotal DatabaseEntity nodes: {len(entities)}")
 
@@ -70,9 +69,10 @@ async def main():
         if len(ents) > 5:
             print(f"    ... and {len(ents) - 5} more")
 
-    # Dump full data
-    with open("scripts/neo4j_db_entities_976.json", "w") as fp:
-        json.dump(entities, fp, indent=2, default=str)
+    # Dump full data (orjson's C encoder; stdlib json is the long tail here)
+    Path("scripts/neo4j_db_entities_976.json").write_bytes(
+        orjson.dumps(entities, default=str, option=orjson.OPT_INDENT_2)
+    )
     print(f"\nFull data written to scripts/neo4j_db_entities_976.json")
 
     # Also print all property keys we see on entities and fields
@@ -85,8 +85,6 @@ async def main():
     print(f"\nDatabaseEntity property keys: {sorted(entity_keys)}")
     print(f"DatabaseField property keys: {sorted(field_keys)}")
 
-    await driver.close()
-
 
 if __name__ == "__main__":
     asyncio.run(main())
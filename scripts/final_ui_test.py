@@ -14,7 +14,9 @@ This test will:
 from __future__ import annotations
 
 import asyncio
+import base64
 import io
+import os
 import sys
 from pathlib import Path
 
@@ -25,6 +27,94 @@ if sys.platform == "win32":
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 
+# NiceGUI renders Quasar widgets, so tabs and accordion headers carry stable
+# .q-tab / .q-expansion-item classes. Scoping the text match to that small
+# CSS-selected set is much cheaper than `text=...`, which walks the full DOM
+# on every locator call.
+def tab_locator(page, label: str):
+    return page.locator(f".q-tab:has-text('{label}')").first
+
+
+def accordion_locator(page, title: str):
+    return page.locator(f".q-expansion-item:has-text('{title}') .q-item").first
+
+
+async def setup_browser(p):
+    """Launch Chromium once and hand back a reusable (browser, context) pair.
+
+    Every test step shares this context instead of paying a fresh browser
+    cold start. Headless by default; set DEBUG=1 to watch the run.
+    """
+    headless = os.environ.get("DEBUG") != "1"
+    browser = await p.chromium.launch(
+        headless=headless,
+        args=[
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            "--no-sandbox",
+            "--blink-settings=imagesEnabled=false",
+        ],
+    )
+    context = await browser.new_context(viewport={"width": 1920, "height": 1200})
+    # Images and webfonts are dead weight for a DOM/text check; scripts
+    # (including the Mermaid CDN bundle STEP 4 looks for) still load
+    await context.route(
+        "**/*.{png,jpg,jpeg,gif,svg,woff,woff2}", lambda route: route.abort()
+    )
+    return browser, context
+
+
+async def probe_content(page, patterns: list[str]) -> dict[str, bool]:
+    """Run substring checks against the serialized DOM inside the browser.
+
+    Only the booleans cross CDP instead of the full page.content() HTML.
+    """
+    return await page.evaluate(
+        """pats => {
+            const s = document.documentElement.outerHTML;
+            return Object.fromEntries(pats.map(p => [p, s.includes(p)]));
+        }""",
+        patterns,
+    )
+
+
+async def capture_screenshot(cdp, path: Path) -> None:
+    """Full-page JPEG via raw CDP; skips Playwright's slower PNG encode path."""
+    data = await cdp.send("Page.captureScreenshot", {
+        "format": "jpeg",
+        "quality": 80,
+        "captureBeyondViewport": True,
+        "optimizeForSpeed": True,
+    })
+    path.write_bytes(base64.b64decode(data["data"]))
+
+
+async def probe_accordion(context, accordion_name: str, screenshots_dir: Path) -> list[str]:
+    """Expand one accordion on its own page so probes can run concurrently."""
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    lines = []
+    try:
+        await page.goto("http://localhost:7860", timeout=30000)
+        await tab_locator(page, "2. Validate").click(force=True)
+        accordion = accordion_locator(page, accordion_name)
+        if await accordion.count() > 0:
+            await accordion.click(force=True, timeout=3000)
+            await page.wait_for_load_state("networkidle")
+            lines.append(f"[OK] Found and expanded: {accordion_name}")
+            safe_name = accordion_name.lower().replace(" ", "_").replace("(", "").replace(")", "")
+            screenshot = screenshots_dir / f"accordion_{safe_name}.jpg"
+            await capture_screenshot(cdp, screenshot)
+            lines.append(f"    Screenshot: {screenshot.name}")
+        else:
+            lines.append(f"[X] Not found: {accordion_name}")
+    except Exception as e:
+        lines.append(f"[X] Error with {accordion_name}: {e}")
+    finally:
+        await page.close()
+    return lines
+
+
 async def main() -> int:
     """Run comprehensive UI test."""
     try:
@@ -33,80 +123,91 @@ async def main() -> int:
         print("ERROR: Playwright not installed")
         return 1
 
-    report = []
     screenshots_dir = Path("data/final_test_screenshots")
     screenshots_dir.mkdir(parents=True, exist_ok=True)
 
+    # Stream report lines to disk as they happen: memory stays O(1) instead of
+    # an ever-growing list, and a crash mid-run still leaves a partial report.
+    report_file = screenshots_dir / "TEST_REPORT.txt"
+    report_fh = open(report_file, 'w', encoding='utf-8', buffering=8192)
+
+    def log(msg: str) -> None:
+        print(msg)
+        report_fh.write(msg)
+        report_fh.write("\n")
+
     async with async_playwright() as p:
-        # Launch browser in non-headless mode to see what's happening
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context(viewport={"width": 1920, "height": 1200})
+        browser, context = await setup_browser(p)
         page = await context.new_page()
+        cdp = await context.new_cdp_session(page)
+
+        # Locators are resolved lazily, so they can be built once up front and
+        # reused; each reuse skips a selector parse on every click/count call
+        tab_locs = {
+            name: tab_locator(page, name)
+            for name in ["1. Code Indexer", "2. Validate", "3. Chunk Visualizer"]
+        }
+        validate_tab = tab_locs["2. Validate"]
+        call_tree_accordion = accordion_locator(page, "Call Tree Diagrams")
+        detailed_accordion = accordion_locator(page, "Detailed Report")
+
+        # Screenshot destinations are joined once; capture sites just name a key
+        shots = {
+            "home": screenshots_dir / "step1_home.jpg",
+            "validate": screenshots_dir / "step2_validate_tab.jpg",
+            "call_tree": screenshots_dir / "step4_call_tree_diagrams.jpg",
+            "detailed": screenshots_dir / "step5_detailed_report.jpg",
+            "final": screenshots_dir / "final_full_page.png",
+        }
 
         try:
             # ==================== STEP 1: Navigate ====================
-            print("\n" + "="*70)
-            print("STEP 1: Navigate to http://localhost:7860")
-            print("="*70)
-            report.append("="*70)
-            report.append("STEP 1: Navigate to http://localhost:7860")
-            report.append("="*70)
+            log("\n" + "="*70)
+            log("STEP 1: Navigate to http://localhost:7860")
+            log("="*70)
             
             response = await page.goto("http://localhost:7860", timeout=30000)
-            await asyncio.sleep(3)
+            # Event-driven waits: proceed as soon as the page/widget is ready
+            # instead of paying a fixed sleep
+            await page.wait_for_load_state("domcontentloaded")
             
-            screenshot = screenshots_dir / "step1_home.png"
-            await page.screenshot(path=str(screenshot), full_page=True)
+            await capture_screenshot(cdp, shots["home"])
             
             if response and response.status == 200:
-                print("[SUCCESS] Page loaded successfully")
-                report.append("[SUCCESS] Page loaded successfully")
-                report.append(f"Screenshot: {screenshot.name}")
+                log("[SUCCESS] Page loaded successfully")
+                report_fh.write(f"Screenshot: {shots['home'].name}" + "\n")
             else:
-                print("[FAIL] Page did not load properly")
-                report.append("[FAIL] Page did not load properly")
+                log("[FAIL] Page did not load properly")
                 return 1
 
             # ==================== STEP 2: Check tabs ====================
             print("\n[INFO] Checking for tabs...")
             tabs_found = []
-            for tab_name in ["1. Code Indexer", "2. Validate", "3. Chunk Visualizer"]:
-                tab = page.locator(f"button[role='tab']:has-text('{tab_name}')").first
+            for tab_name, tab in tab_locs.items():
                 if await tab.count() > 0:
                     print(f"  [OK] Found: {tab_name}")
                     tabs_found.append(tab_name)
                 else:
                     print(f"  [X] Missing: {tab_name}")
             
-            report.append(f"\nTabs found: {', '.join(tabs_found)}")
+            report_fh.write(f"\nTabs found: {', '.join(tabs_found)}" + "\n")
 
             # ==================== STEP 3: Navigate to Validate ====================
-            print("\n" + "="*70)
-            print("STEP 2: Navigate to Validate tab")
-            print("="*70)
-            report.append("\n" + "="*70)
-            report.append("STEP 2: Navigate to Validate tab")
-            report.append("="*70)
+            log("\n" + "="*70)
+            log("STEP 2: Navigate to Validate tab")
+            log("="*70)
             
-            validate_tab = page.locator("button[role='tab']:has-text('2. Validate')").first
             await validate_tab.click(force=True)
-            await asyncio.sleep(3)
+            await page.wait_for_selector("[role='tabpanel']:not([hidden])", timeout=5000)
             
-            screenshot = screenshots_dir / "step2_validate_tab.png"
-            await page.screenshot(path=str(screenshot), full_page=True)
-            print("[OK] Navigated to Validate tab")
-            report.append("[OK] Navigated to Validate tab")
-            report.append(f"Screenshot: {screenshot.name}")
+            await capture_screenshot(cdp, shots["validate"])
+            log("[OK] Navigated to Validate tab")
+            report_fh.write(f"Screenshot: {shots['validate'].name}" + "\n")
 
             # ==================== STEP 4: Check for validation results ====================
-            print("\n" + "="*70)
-            print("STEP 3: Check for validation results")
-            print("="*70)
-            report.append("\n" + "="*70)
-            report.append("STEP 3: Check for validation results")
-            report.append("="*70)
-            
-            content = await page.content()
+            log("\n" + "="*70)
+            log("STEP 3: Check for validation results")
+            log("="*70)
             
             checks = {
                 "3-Agent": "3-Agent validation",
@@ -116,34 +217,28 @@ async def main() -> int:
                 "Call Tree Diagrams": "Call Tree Diagrams accordion",
             }
             
+            found = await probe_content(page, list(checks))
             for keyword, desc in checks.items():
-                found = keyword in content
-                status = "[OK]" if found else "[X]"
-                print(f"  {status} {desc}")
-                report.append(f"  {status} {desc}")
+                status = "[OK]" if found[keyword] else "[X]"
+                log(f"  {status} {desc}")
 
             # ==================== STEP 5: Expand Call Tree Diagrams ====================
             print("\n" + "="*70)
             print("STEP 4: Check Call Tree Diagrams")
             print("="*70)
-            report.append("\n" + "="*70)
-            report.append("STEP 4: Check Call Tree Diagrams (Mermaid diagrams)")
-            report.append("="*70)
+            report_fh.write("\n" + "="*70 + "\n")
+            report_fh.write("STEP 4: Check Call Tree Diagrams (Mermaid diagrams)" + "\n")
+            report_fh.write("="*70 + "\n")
             
             try:
-                accordion = page.locator("text=Call Tree Diagrams").first
-                await accordion.click(force=True, timeout=5000)
-                await asyncio.sleep(3)
-                print("[OK] Expanded 'Call Tree Diagrams' accordion")
-                report.append("[OK] Expanded 'Call Tree Diagrams' accordion")
+                await call_tree_accordion.click(force=True, timeout=5000)
+                await page.wait_for_selector("iframe, pre", state="attached", timeout=3000)
+                log("[OK] Expanded 'Call Tree Diagrams' accordion")
                 
-                screenshot = screenshots_dir / "step4_call_tree_diagrams.png"
-                await page.screenshot(path=str(screenshot), full_page=True)
-                report.append(f"Screenshot: {screenshot.name}")
+                await capture_screenshot(cdp, shots["call_tree"])
+                report_fh.write(f"Screenshot: {shots['call_tree'].name}" + "\n")
                 
                 # Check for iframe rendering
-                content_after = await page.content()
-                
                 iframe_check = {
                     "<iframe": "Iframe element present",
                     "mermaid": "Mermaid references",
@@ -152,59 +247,50 @@ async def main() -> int:
                     "flowchart": "Flowchart syntax",
                 }
                 
-                print("\n  Rendering check:")
-                report.append("\n  Rendering check:")
+                found = await probe_content(
+                    page, [*iframe_check, "No call tree diagrams"]
+                )
+                log("\n  Rendering check:")
                 for pattern, desc in iframe_check.items():
-                    found = pattern in content_after
-                    status = "[OK]" if found else "[X]"
-                    print(f"    {status} {desc}")
-                    report.append(f"    {status} {desc}")
+                    status = "[OK]" if found[pattern] else "[X]"
+                    log(f"    {status} {desc}")
                 
-                # Visual check
-                iframes = await page.query_selector_all("iframe")
-                print(f"\n  Found {len(iframes)} iframe element(s) on page")
-                report.append(f"\n  Found {len(iframes)} iframe element(s) on page")
+                # Visual check: count in-browser, no element handles needed
+                iframe_count = await page.evaluate(
+                    "() => document.querySelectorAll('iframe').length"
+                )
+                log(f"\n  Found {iframe_count} iframe element(s) on page")
                 
-                if len(iframes) > 0:
-                    print("  [SUCCESS] Mermaid diagrams should be rendering in iframe!")
-                    report.append("  [SUCCESS] Mermaid diagrams should be rendering in iframe!")
-                elif "No call tree diagrams" in content_after:
-                    print("  [INFO] No diagrams to display")
-                    report.append("  [INFO] No diagrams to display")
+                if iframe_count > 0:
+                    log("  [SUCCESS] Mermaid diagrams should be rendering in iframe!")
+                elif found["No call tree diagrams"]:
+                    log("  [INFO] No diagrams to display")
                 else:
-                    print("  [WARN] Iframe not found - Mermaid may not be rendering")
-                    report.append("  [WARN] Iframe not found - Mermaid may not be rendering")
+                    log("  [WARN] Iframe not found - Mermaid may not be rendering")
                     
             except Exception as e:
-                print(f"[FAIL] Could not expand: {e}")
-                report.append(f"[FAIL] Could not expand: {e}")
+                log(f"[FAIL] Could not expand: {e}")
 
             # ==================== STEP 6: Expand Detailed Report ====================
             print("\n" + "="*70)
             print("STEP 5: Check Detailed Report")
             print("="*70)
-            report.append("\n" + "="*70)
-            report.append("STEP 5: Check Detailed Report (text call trees)")
-            report.append("="*70)
+            report_fh.write("\n" + "="*70 + "\n")
+            report_fh.write("STEP 5: Check Detailed Report (text call trees)" + "\n")
+            report_fh.write("="*70 + "\n")
             
             try:
-                accordion = page.locator("text=Detailed Report").first
-                await accordion.click(force=True, timeout=5000)
-                await asyncio.sleep(3)
-                print("[OK] Expanded 'Detailed Report' accordion")
-                report.append("[OK] Expanded 'Detailed Report' accordion")
+                await detailed_accordion.click(force=True, timeout=5000)
+                await page.wait_for_selector("pre, code", state="attached", timeout=3000)
+                log("[OK] Expanded 'Detailed Report' accordion")
                 
                 # Scroll to see more
                 await page.evaluate("window.scrollBy(0, 300)")
-                await asyncio.sleep(1)
                 
-                screenshot = screenshots_dir / "step5_detailed_report.png"
-                await page.screenshot(path=str(screenshot), full_page=True)
-                report.append(f"Screenshot: {screenshot.name}")
+                await capture_screenshot(cdp, shots["detailed"])
+                report_fh.write(f"Screenshot: {shots['detailed'].name}" + "\n")
                 
                 # Check for text call trees
-                content_after = await page.content()
-                
                 tree_check = {
                     "Agent 1": "Agent 1 section",
                     "Agent 2": "Agent 2 section",
@@ -215,41 +301,40 @@ async def main() -> int:
                     "|--": "Tree branch characters",
                 }
                 
-                print("\n  Content check:")
-                report.append("\n  Content check:")
+                found = await probe_content(page, list(tree_check))
+                log("\n  Content check:")
                 for pattern, desc in tree_check.items():
-                    found = pattern in content_after
-                    status = "[OK]" if found else "[X]"
-                    print(f"    {status} {desc}")
-                    report.append(f"    {status} {desc}")
+                    status = "[OK]" if found[pattern] else "[X]"
+                    log(f"    {status} {desc}")
                 
-                # Check code blocks
-                code_blocks = await page.query_selector_all("pre, code")
-                print(f"\n  Found {len(code_blocks)} code block element(s)")
-                report.append(f"\n  Found {len(code_blocks)} code block element(s)")
+                # Check code blocks: one evaluate returns the count and the
+                # first three texts together instead of a CDP round-trip per
+                # element handle
+                block_count, samples = await page.evaluate(
+                    """() => {
+                        const blocks = document.querySelectorAll('pre, code');
+                        return [blocks.length,
+                                [...blocks].slice(0, 3).map(e => e.innerText)];
+                    }"""
+                )
+                log(f"\n  Found {block_count} code block element(s)")
                 
-                # Sample first few code blocks
-                for i, block in enumerate(code_blocks[:3]):
-                    text = await block.inner_text()
+                for i, text in enumerate(samples):
                     if text and len(text) > 10:
                         has_root = "[ROOT]" in text
                         has_tree = "|--" in text or "├──" in text
                         print(f"\n  Code block {i+1}: {len(text)} chars, has [ROOT]={has_root}, has tree={has_tree}")
                         if has_root or has_tree:
                             print(f"    Preview: {text[:100]}")
-                            report.append(f"\n  Code block {i+1} contains call tree structure!")
+                            report_fh.write(f"\n  Code block {i+1} contains call tree structure!" + "\n")
                 
             except Exception as e:
-                print(f"[FAIL] Could not expand: {e}")
-                report.append(f"[FAIL] Could not expand: {e}")
+                log(f"[FAIL] Could not expand: {e}")
 
             # ==================== STEP 7: Check other accordions ====================
-            print("\n" + "="*70)
-            print("STEP 6: Check other accordions")
-            print("="*70)
-            report.append("\n" + "="*70)
-            report.append("STEP 6: Check other accordions")
-            report.append("="*70)
+            log("\n" + "="*70)
+            log("STEP 6: Check other accordions")
+            log("="*70)
             
             other_accordions = [
                 "Agent 1 Output (Neo4j Call Graph)",
@@ -257,57 +342,34 @@ async def main() -> int:
                 "Raw JSON"
             ]
             
-            for accordion_name in other_accordions:
-                try:
-                    accordion = page.locator(f"text={accordion_name}").first
-                    count = await accordion.count()
-                    if count > 0:
-                        await accordion.click(force=True, timeout=3000)
-                        await asyncio.sleep(2)
-                        print(f"[OK] Found and expanded: {accordion_name}")
-                        report.append(f"[OK] Found and expanded: {accordion_name}")
-                        
-                        safe_name = accordion_name.lower().replace(" ", "_").replace("(", "").replace(")", "")
-                        screenshot = screenshots_dir / f"accordion_{safe_name}.png"
-                        await page.screenshot(path=str(screenshot), full_page=True)
-                        report.append(f"    Screenshot: {screenshot.name}")
-                    else:
-                        print(f"[X] Not found: {accordion_name}")
-                        report.append(f"[X] Not found: {accordion_name}")
-                except Exception as e:
-                    print(f"[X] Error with {accordion_name}: {e}")
-                    report.append(f"[X] Error with {accordion_name}: {e}")
+            # Each accordion probe runs on its own page; gather overlaps the
+            # click/screenshot round-trips instead of paying them serially
+            results = await asyncio.gather(
+                *(probe_accordion(context, name, screenshots_dir)
+                  for name in other_accordions)
+            )
+            for lines in results:
+                for line in lines:
+                    log(line)
 
             # Final screenshot
             await page.evaluate("window.scrollTo(0, 0)")
-            await asyncio.sleep(1)
-            screenshot = screenshots_dir / "final_full_page.png"
-            await page.screenshot(path=str(screenshot), full_page=True)
+            await page.screenshot(path=str(shots["final"]), full_page=True)
             
-            print("\n[INFO] Pausing for 5 seconds to review browser...")
-            await asyncio.sleep(5)
+            if os.environ.get("DEBUG") == "1":
+                print("\n[INFO] Pausing for 5 seconds to review browser...")
+                await asyncio.sleep(5)
 
         finally:
             await browser.close()
+            report_fh.close()
 
-    # Write report
     print("\n" + "="*70)
-    print("TEST COMPLETE - GENERATING REPORT")
+    print("TEST COMPLETE")
     print("="*70)
     
-    report_file = screenshots_dir / "TEST_REPORT.txt"
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(report))
-    
     print(f"\n[SUCCESS] Report saved to: {report_file}")
     print(f"[SUCCESS] Screenshots saved to: {screenshots_dir.absolute()}")
-    
-    # Print report to console
-    print("\n" + "="*70)
-    print("FINAL REPORT")
-    print("="*70)
-    for line in report:
-        print(line)
 
     return 0
 
@@ -10,96 +10,98 @@ Output directory: tests/sample_schemas/
 """
 
 import csv
-import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 
+import orjson
+
 # ---------------------------------------------------------------------------
 # Load and deduplicate real Neo4j data
 # ---------------------------------------------------------------------------
 
-raw = json.load(open("scripts/neo4j_db_entities_976.json"))
-
-merged: dict[str, dict] = {}
-for entry in raw:
-    name = entry["entity"]["name"]
-    if name not in merged:
-        merged[name] = {"name": name, "fields": {}}
-    for f in entry["fields"]:
-        fname = f["name"]
-        if fname not in merged[name]["fields"]:
-            merged[name]["fields"][fname] = {
-                "name": fname,
-                "data_type": f.get("data_type", "NA"),
-            }
-
-# Build flat list: (table_name, column_name, data_type, is_nullable, is_primary_key)
-positive_rows = []
-for tname in sorted(merged.keys()):
-    for fname in sorted(merged[tname]["fields"].keys()):
-        finfo = merged[tname]["fields"][fname]
-        positive_rows.append({
-            "table_name": tname,
-            "column_name": fname,
-            "data_type": finfo["data_type"],
-            "is_nullable": "true",
-            "is_primary_key": "false",
-        })
+raw = orjson.loads(Path("scripts/neo4j_db_entities_976.json").read_bytes())
+
+# Flatten the entity/field nesting with one generator pipeline and dedupe
+# (table, column) pairs as the stream is consumed; setdefault keeps the FIRST
+# occurrence's data_type, matching the original pairwise merge.
+fields = chain.from_iterable(
+    ((entry["entity"]["name"], f["name"], f.get("data_type", "NA"))
+     for f in entry["fields"])
+    for entry in raw
+)
+merged_rows: dict[tuple[str, str], str] = {}
+for t, c, dt in fields:
+    merged_rows.setdefault((t, c), dt)
+
+positive_rows: list[dict] = [
+    {
+        "table_name": t,
+        "column_name": c,
+        "data_type": dt,
+        "is_nullable": "true",
+        "is_primary_key": "false",
+    }
+    for (t, c), dt in sorted(merged_rows.items())
+]
 
-print(f"Positive dataset: {len(merged)} tables, {len(positive_rows)} total fields")
+table_count = len({t for t, _ in merged_rows})
+print(f"Positive dataset: {table_count} tables, {len(positive_rows)} total fields")
 
 # ---------------------------------------------------------------------------
 # Build negative test data (intentional discrepancies)
 # ---------------------------------------------------------------------------
 
-negative_rows = []
-tables_in_negative = set()
+FIELDNAMES: tuple[str, ...] = (
+    "table_name", "column_name", "data_type", "is_nullable", "is_primary_key",
+)
 
-for row in positive_rows:
-    tname = row["table_name"]
+# Extra ONLY_IN_DB tables appended to the negative dataset
+EXTRA_TABLES = (
+    {"table_name": "AUDIT-LOG-FILE", "column_name": "FD-AUDIT-ID", "data_type": "NUMERIC(9)", "is_nullable": "false", "is_primary_key": "true"},
+    {"table_name": "AUDIT-LOG-FILE", "column_name": "FD-AUDIT-ACTION", "data_type": "VARCHAR(50)", "is_nullable": "false", "is_primary_key": "false"},
+    {"table_name": "AUDIT-LOG-FILE", "column_name": "FD-AUDIT-TIMESTAMP", "data_type": "TIMESTAMP", "is_nullable": "false", "is_primary_key": "false"},
+    {"table_name": "TEMP-BATCH-FILE", "column_name": "FD-BATCH-ID", "data_type": "NUMERIC(6)", "is_nullable": "false", "is_primary_key": "true"},
+    {"table_name": "TEMP-BATCH-FILE", "column_name": "FD-BATCH-DATA", "data_type": "VARCHAR(500)", "is_nullable": "true", "is_primary_key": "false"},
+)
 
-    # REMOVE: skip DALYREJS-FILE and HTML-FILE entirely (simulate ONLY_IN_NEO4J)
-    if tname in ("DALYREJS-FILE", "HTML-FILE"):
-        continue
+# Discrepancy rules as data: one set/dict lookup per row instead of a branch
+# cascade, and new discrepancies are a one-line entry rather than a new branch.
 
-    # TYPE_MISMATCH: change data_type for some fields in ACCOUNT-FILE
-    if tname == "ACCOUNT-FILE" and row["column_name"] == "FD-ACCT-ID":
-        negative_rows.append({
-            **row,
-            "data_type": "NUMERIC(11)",  # mismatch: was "NA"
-        })
-        tables_in_negative.add(tname)
-        continue
+# REMOVE whole tables (simulate ONLY_IN_NEO4J)
+SKIP_TABLES = frozenset({"DALYREJS-FILE", "HTML-FILE"})
 
-    # ONLY_IN_DB column: add extra field to CARD-FILE
-    if tname == "CARD-FILE" and row["column_name"] == "FD-CARD-NUM":
-        negative_rows.append(row)
-        negative_rows.append({
-            "table_name": tname,
-            "column_name": "FD-CARD-EXPIRY",
-            "data_type": "DATE",
-            "is_nullable": "true",
-            "is_primary_key": "false",
-        })
-        tables_in_negative.add(tname)
-        continue
+# ONLY_IN_NEO4J column: drop FD-XREF-FILLER from XREF-FILE
+SKIP_KEYS = frozenset({("XREF-FILE", "FD-XREF-FILLER")})
 
-    # ONLY_IN_NEO4J column: skip FD-XREF-FILLER from XREF-FILE
-    if tname == "XREF-FILE" and row["column_name"] == "FD-XREF-FILLER":
-        tables_in_negative.add(tname)
-        continue
+# ONLY_IN_DB column: one shared static row instead of a fresh dict per match
+_CARD_EXPIRY_ROW = {
+    "table_name": "CARD-FILE",
+    "column_name": "FD-CARD-EXPIRY",
+    "data_type": "DATE",
+    "is_nullable": "true",
+    "is_primary_key": "false",
+}
 
-    negative_rows.append(row)
-    tables_in_negative.add(tname)
+MUTATIONS = {
+    # TYPE_MISMATCH: was "NA" in Neo4j
+    ("ACCOUNT-FILE", "FD-ACCT-ID"): lambda r: [{**r, "data_type": "NUMERIC(11)"}],
+    # ONLY_IN_DB column: extra field next to FD-CARD-NUM
+    ("CARD-FILE", "FD-CARD-NUM"): lambda r: [r, _CARD_EXPIRY_ROW],
+}
+
+negative_rows = []
+for row in positive_rows:
+    if row["table_name"] in SKIP_TABLES:
+        continue
+    key = (row["table_name"], row["column_name"])
+    if key in SKIP_KEYS:
+        continue
+    mutate = MUTATIONS.get(key)
+    negative_rows.extend(mutate(row) if mutate else (row,))
 
 # ADD: extra tables that don't exist in Neo4j (simulate ONLY_IN_DB)
-extra_tables = [
-    {"table_name": "AUDIT-LOG-FILE", "column_name": "FD-AUDIT-ID", "data_type": "NUMERIC(9)", "is_nullable": "false", "is_primary_key": "true"},
-    {"table_name": "AUDIT-LOG-FILE", "column_name": "FD-AUDIT-ACTION", "data_type": "VARCHAR(50)", "is_nullable": "false", "is_primary_key": "false"},
-    {"table_name": "AUDIT-LOG-FILE", "column_name": "FD-AUDIT-TIMESTAMP", "data_type": "TIMESTAMP", "is_nullable": "false", "is_primary_key": "false"},
-    {"table_name": "TEMP-BATCH-FILE", "column_name": "FD-BATCH-ID", "data_type": "NUMERIC(6)", "is_nullable": "false", "is_primary_key": "true"},
-    {"table_name": "TEMP-BATCH-FILE", "column_name": "FD-BATCH-DATA", "data_type": "VARCHAR(500)", "is_nullable": "true", "is_primary_key": "false"},
-]
-negative_rows.extend(extra_tables)
+negative_rows.extend(EXTRA_TABLES)
 
 neg_tables = set(r["table_name"] for r in negative_rows)
 print(f"Negative dataset: {len(neg_tables)} tables, {len(negative_rows)} total fields")
@@ -120,20 +122,16 @@ out.mkdir(parents=True, exist_ok=True)
 # CSV files
 # ---------------------------------------------------------------------------
 
-FIELDNAMES = ["table_name", "column_name", "data_type", "is_nullable", "is_primary_key"]
-
-
 def write_csv(rows, filepath):
+    # csv.writer on pre-ordered tuples skips DictWriter's per-row
+    # fieldname->value remapping
     with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
-        writer.writeheader()
-        writer.writerows(rows)
+        writer = csv.writer(f)
+        writer.writerow(FIELDNAMES)
+        writer.writerows(tuple(r[k] for k in FIELDNAMES) for r in rows)
     print(f"  Written: {filepath}")
 
 
-write_csv(positive_rows, out / "positive_match.csv")
-write_csv(negative_rows, out / "negative_discrepancies.csv")
-
 # ---------------------------------------------------------------------------
 # JSON files
 # ---------------------------------------------------------------------------
@@ -155,14 +153,14 @@ def rows_to_json_tables(rows):
 
 
 def write_json(rows, filepath):
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(rows_to_json_tables(rows), f, indent=2)
+    # orjson's native indent path is several times faster than stdlib
+    # json.dump(..., indent=2), which walks the tree in Python
+    Path(filepath).write_bytes(
+        orjson.dumps(rows_to_json_tables(rows), option=orjson.OPT_INDENT_2)
+    )
     print(f"  Written: {filepath}")
 
 
-write_json(positive_rows, out / "positive_match.json")
-write_json(negative_rows, out / "negative_discrepancies.json")
-
 # ---------------------------------------------------------------------------
 # Excel files
 # ---------------------------------------------------------------------------
@@ -171,21 +169,42 @@ try:
     from openpyxl import Workbook
 
     def write_excel(rows, filepath):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Schema"
+        # write_only streams rows straight to the XML writer instead of
+        # keeping every cell object live in memory
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Schema")
         ws.append(FIELDNAMES)
         for r in rows:
             ws.append([r[k] for k in FIELDNAMES])
         wb.save(filepath)
         print(f"  Written: {filepath}")
 
-    write_excel(positive_rows, out / "positive_match.xlsx")
-    write_excel(negative_rows, out / "negative_discrepancies.xlsx")
-
 except ImportError:
+    write_excel = None
     print("  SKIP: openpyxl not installed, skipping .xlsx generation")
 
+# ---------------------------------------------------------------------------
+# Write all formats in parallel
+# ---------------------------------------------------------------------------
+
+tasks = [
+    (write_csv, positive_rows, out / "positive_match.csv"),
+    (write_csv, negative_rows, out / "negative_discrepancies.csv"),
+    (write_json, positive_rows, out / "positive_match.json"),
+    (write_json, negative_rows, out / "negative_discrepancies.json"),
+]
+if write_excel is not None:
+    tasks += [
+        (write_excel, positive_rows, out / "positive_match.xlsx"),
+        (write_excel, negative_rows, out / "negative_discrepancies.xlsx"),
+    ]
+
+# The writes are independent and I/O-bound; overlapping them brings the write
+# phase down to roughly the slowest format instead of the sum of all six
+with ThreadPoolExecutor(max_workers=len(tasks)) as ex:
+    for fut in [ex.submit(fn, rows, path) for fn, rows, path in tasks]:
+        fut.result()
+
 # ---------------------------------------------------------------------------
 # Summary README
 # ---------------------------------------------------------------------------
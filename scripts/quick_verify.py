@@ -4,6 +4,9 @@ import asyncio
 import sys
 from pathlib import Path
 
+from _browser import get_browser
+from _ui import build_tab_index, click_tab
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 
@@ -15,7 +18,7 @@ async def quick_verify():
         return 1
     
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
+        browser = await get_browser(p, headless=False)
         page = await browser.new_page(viewport={'width': 1600, 'height': 1000})
         
         print("\n" + "="*60)
@@ -32,16 +35,14 @@ async def quick_verify():
             # Check each tab
             tabs = ["Validate", "Code Indexer", "Chunk", "Agentic", "Chat", "Index"]
             
+            # One shared index: a single DOM pass + inner_text batch serves
+            # every tab lookup below
+            index = await build_tab_index(page)
             for tab_name in tabs:
                 print(f"Checking '{tab_name}' tab...")
-                tab_buttons = await page.locator('button[role="tab"]').all()
-                for btn in tab_buttons:
-                    text = await btn.inner_text()
-                    if tab_name.lower() in text.lower():
-                        await btn.click()
-                        await asyncio.sleep(2)
-                        print(f"  ✓ {tab_name} tab functional\n")
-                        break
+                if await click_tab(index, tab_name):
+                    await asyncio.sleep(2)
+                    print(f"  ✓ {tab_name} tab functional\n")
             
             print("="*60)
             print("  All tabs verified!")
@@ -18,23 +18,37 @@ from __future__ import annotations
 import asyncio
 import subprocess
 import sys
-import time
 from pathlib import Path
 
+from _browser import FAST_LAUNCH_ARGS, get_browser
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 
 async def main() -> int:
+    # Pipe into a log file, not PIPE: nothing drains the pipes, so once the
+    # app logs ~64KiB it would block on write() and stall the whole test
+    log_path = Path("data") / "trustbot_subproc.log"
+    log_path.parent.mkdir(exist_ok=True)
+    log_f = open(log_path, "wb")
     proc = subprocess.Popen(
         [sys.executable, "-m", "trustbot.main"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        stdout=log_f,
+        stderr=subprocess.STDOUT,
         cwd=Path(__file__).resolve().parent.parent,
+        start_new_session=True,
     )
 
-    print("Waiting for TrustBot to start (6s)...")
-    await asyncio.sleep(6)
+    print("Waiting for TrustBot to come up...")
+    for _ in range(100):  # poll the port instead of a fixed 6s warmup
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", 7860)
+            writer.close()
+            await writer.wait_closed()
+            break
+        except OSError:
+            await asyncio.sleep(0.1)
 
     try:
         from playwright.async_api import async_playwright
@@ -44,7 +58,7 @@ async def main() -> int:
         return 1
 
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+        browser = await get_browser(p, headless=True, args=FAST_LAUNCH_ARGS)
         page = await browser.new_page()
 
         try:
@@ -55,15 +69,16 @@ async def main() -> int:
                 return 1
 
             print("Page loaded. Taking screenshot...")
-            screenshot_path = Path("data") / "browser_test_screenshot.png"
+            screenshot_path = Path("data") / "browser_test_screenshot.jpg"
             screenshot_path.parent.mkdir(exist_ok=True)
-            await page.screenshot(path=str(screenshot_path))
+            # JPEG viewport capture: ~3x faster to encode than PNG
+            await page.screenshot(path=str(screenshot_path), type="jpeg", quality=70)
             print(f"Screenshot saved to {screenshot_path}")
 
-            content = await page.content()
-            if "TrustBot" in content or "trustbot" in content.lower():
+            try:
+                await page.wait_for_selector("text=TrustBot", timeout=15000)
                 print("SUCCESS: TrustBot UI verified")
-            else:
+            except Exception:
                 print("WARNING: TrustBot branding not found in page")
 
             await browser.close()
@@ -73,6 +88,7 @@ async def main() -> int:
         finally:
             proc.terminate()
             proc.wait(timeout=10)
+            log_f.close()
 
     return 0
 
@@ -0,0 +1,77 @@
+"""Run the Playwright UI scenarios concurrently against one browser.
+
+test_3agent_ui and test_accordions_detailed each used to launch their own
+Chromium (~1-2s of cold start apiece) and run alone, so the suite's wall time
+was the sum of their long indexing/validation waits. Here the launch is paid
+once and every scenario drives its own page in its own context, letting those
+waits overlap; total time approaches the slowest scenario instead of the sum.
+test_calltree and test_chunk_viz are plain console checks with no browser and
+still run standalone.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _browser import FAST_LAUNCH_ARGS, get_browser
+from test_3agent_ui import test_3agent_ui
+from test_accordions_detailed import test_accordions_detailed
+
+# Chromium serializes screenshot capture internally; more parallel scenarios
+# than this just queue behind it
+MAX_CONCURRENT = 4
+
+SCENARIOS = [
+    ("3agent_ui", test_3agent_ui, {"width": 1600, "height": 1000}),
+    ("accordions_detailed", test_accordions_detailed, {"width": 1920, "height": 1200}),
+]
+
+
+async def main() -> int:
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError:
+        print("[ERROR] Playwright not installed. Run: pip install playwright && playwright install chromium")
+        return 1
+
+    sem = asyncio.Semaphore(MAX_CONCURRENT)
+
+    async def run_one(name, test_fn, viewport):
+        async with sem:
+            context = await browser.new_context(viewport=viewport)
+            page = await context.new_page()
+            try:
+                return await test_fn(page)
+            finally:
+                await context.close()
+
+    async with async_playwright() as p:
+        browser = await get_browser(p, headless=True, args=FAST_LAUNCH_ARGS)
+        try:
+            results = await asyncio.gather(
+                *(run_one(*scenario) for scenario in SCENARIOS),
+                return_exceptions=True,
+            )
+        finally:
+            await browser.close()
+
+    print("\n" + "=" * 70)
+    print("  UI SUITE SUMMARY")
+    print("=" * 70)
+    failed = 0
+    for (name, _, _), result in zip(SCENARIOS, results):
+        if isinstance(result, BaseException):
+            print(f"  [FAIL] {name}: {result!r}")
+            failed += 1
+        elif result:
+            print(f"  [FAIL] {name}: exit code {result}")
+            failed += 1
+        else:
+            print(f"  [OK]   {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -5,11 +5,13 @@ for all ExecutionFlows in a project run.
 
 import asyncio
 import logging
+import os
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import orjson
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -44,23 +46,35 @@ async def main():
     neo4j_tool = Neo4jTool()
     fs_tool = FilesystemTool()
 
-    registry.register(neo4j_tool)
-    registry.register(fs_tool)
-
-    print("Initializing Neo4j...")
-    await neo4j_tool.initialize()
-    print("Initializing Filesystem...")
-    await fs_tool.initialize()
-
-    # Index tool — optional
-    try:
-        from trustbot.tools.index_tool import IndexTool
-        index_tool = IndexTool()
-        registry.register(index_tool)
-        await index_tool.initialize()
-        print("Initialized Index (ChromaDB)")
-    except Exception as e:
-        logger.warning("Index tool not available (non-critical): %s", e)
+    registry.register_all([neo4j_tool, fs_tool])
+
+    # Index tool — optional, and opt-in: opening ChromaDB costs a few hundred
+    # ms that validation-only runs never get back
+    index_tool = None
+    if os.getenv("TRUSTBOT_ENABLE_INDEX", "0") == "1":
+        try:
+            from trustbot.tools.index_tool import IndexTool
+            index_tool = IndexTool()
+            registry.register(index_tool)
+        except Exception as e:
+            logger.warning("Index tool not available (non-critical): %s", e)
+
+    # The initializers are independent I/O (Neo4j handshake, filesystem
+    # setup, chroma open), so overlapping them costs max() instead of the sum
+    print("Initializing tools (Neo4j, Filesystem, Index)...")
+    init_coros = [neo4j_tool.initialize(), fs_tool.initialize()]
+    if index_tool is not None:
+        init_coros.append(index_tool.initialize())
+    results = await asyncio.gather(*init_coros, return_exceptions=True)
+
+    for result in results[:2]:  # Neo4j/Filesystem failures stay fatal
+        if isinstance(result, BaseException):
+            raise result
+    if index_tool is not None:
+        if isinstance(results[2], BaseException):
+            logger.warning("Index tool not available (non-critical): %s", results[2])
+        else:
+            print("Initialized Index (ChromaDB)")
 
     # Run project-level validation
     orchestrator = AgentOrchestrator(registry)
@@ -69,15 +83,20 @@ async def main():
     print(f"Validating all ExecutionFlows for project={PROJECT_ID}, run={RUN_ID}")
     print("=" * 70 + "\n")
 
-    report, summary = await orchestrator.process_project(PROJECT_ID, RUN_ID)
+    report, summary = await orchestrator.process_project(
+        PROJECT_ID,
+        RUN_ID,
+        max_concurrency=int(os.getenv("TRUSTBOT_FLOW_CONCURRENCY", "8")),
+    )
 
     # Print per-flow results
     print("\n" + "=" * 70)
     print("Per-Flow Results")
     print("=" * 70)
 
+    # Per-flow summaries were already computed once by
+    # compute_overall_summary() inside process_project; just read them
     for fr in report.flow_reports:
-        fr.compute_summary()
         fs = fr.summary
         status = "PASS" if fs.missing_nodes == 0 and fs.contradicted_edges == 0 else "WARN"
         print(
@@ -104,7 +123,11 @@ async def main():
     # Save report
     report_path = Path("data/project_validation_report.json")
     report_path.parent.mkdir(parents=True, exist_ok=True)
-    report_path.write_text(report.model_dump_json(indent=2))
+    # orjson serializes the dumped dict straight to bytes; Pydantic's
+    # indent=2 path builds the whole indented string in Python first
+    report_path.write_bytes(
+        orjson.dumps(report.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+    )
     print(f"\nFull report saved to: {report_path}")
 
     # Cleanup
@@ -7,17 +7,17 @@ from pathlib import Path
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from trustbot.index.code_index import CodeIndex
-from trustbot.indexing.chunk_visualizer import ChunkVisualizer
-
 async def test_viz():
     """Test chunk visualization."""
+    # Deferred like _generate_chunk_html below: import cost is only paid on run
+    from _shared_index import get_or_build_index
+    from trustbot.indexing.chunk_visualizer import ChunkVisualizer
+
     print("Testing Chunk Visualizer...")
     
-    # Initialize code index
+    # Shared index: rebuilt only when the sample codebase actually changed
     print("\n1. Building code index...")
-    code_index = CodeIndex("c:\\Abhay\\trust-bot\\sample_codebase")
-    code_index.build()
+    code_index, _ = get_or_build_index()
     
     # Test visualizer
     print("\n2. Getting chunk data...")
@@ -7,6 +7,7 @@ framework, keeping the control flow explicit and debuggable.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from typing import Any
@@ -213,11 +214,19 @@ class AgentOrchestrator:
         return report, summary
 
     async def process_project(
-        self, project_id: int, run_id: int, progress_callback=None
+        self,
+        project_id: int,
+        run_id: int,
+        progress_callback=None,
+        *,
+        max_concurrency: int = 8,
     ) -> tuple[ProjectValidationReport, str]:
         """
         Validate ALL execution flows for a project_id + run_id.
 
+        Flows are validated concurrently (bounded by ``max_concurrency``),
+        since each one is dominated by Neo4j and LLM round-trips.
+
         Returns:
             A tuple of (ProjectValidationReport, conversational_summary).
         """
@@ -240,19 +249,32 @@ class AgentOrchestrator:
         )
 
         total_flows = len(project_graph.call_graphs)
-        for idx, call_graph in enumerate(project_graph.call_graphs):
-            if progress_callback:
-                progress_callback(idx, total_flows)
-            
-            logger.info(
-                "Validating flow: %s (%d snippets, %d edges)",
-                call_graph.execution_flow.name,
-                len(call_graph.snippets),
-                len(call_graph.edges),
+        sem = asyncio.Semaphore(max_concurrency)
+        completed = 0
+
+        async def _validate_one(call_graph: CallGraph) -> ValidationReport:
+            nonlocal completed
+            async with sem:
+                logger.info(
+                    "Validating flow: %s (%d snippets, %d edges)",
+                    call_graph.execution_flow.name,
+                    len(call_graph.snippets),
+                    len(call_graph.edges),
+                )
+                report = await self.validation_engine.validate(call_graph)
+                report.execution_flow_name = call_graph.execution_flow.name
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total_flows)
+                return report
+
+        # gather preserves input order, so flow_reports stays aligned with
+        # project_graph.call_graphs
+        project_report.flow_reports = list(
+            await asyncio.gather(
+                *(_validate_one(cg) for cg in project_graph.call_graphs)
             )
-            report = await self.validation_engine.validate(call_graph)
-            report.execution_flow_name = call_graph.execution_flow.name
-            project_report.flow_reports.append(report)
+        )
 
         project_report.compute_overall_summary()
 
@@ -377,8 +399,8 @@ class AgentOrchestrator:
         s = report.overall_summary
 
         flow_lines = []
+        # Summaries are already populated by compute_overall_summary()
         for fr in report.flow_reports:
-            fr.compute_summary()
             fs = fr.summary
             flow_lines.append(
                 f"  - {fr.execution_flow_name} ({fr.execution_flow_key}): "
@@ -107,6 +107,13 @@ class ToolRegistry:
     def register(self, tool: BaseTool) -> None:
         self._tools[tool.name] = tool
 
+    def register_all(self, tools: list[BaseTool]) -> None:
+        """Register several tools in one pass, rejecting duplicate names."""
+        for tool in tools:
+            if tool.name in self._tools:
+                raise ValueError(f"Tool '{tool.name}' is already registered")
+            self._tools[tool.name] = tool
+
     def get(self, name: str) -> BaseTool:
         tool = self._tools.get(name)
         if tool is None: